@@ -5,6 +5,7 @@ import argparse
 import asyncio
 import sys
 
+from atlassian_mcp.server import HTTP_TRANSPORTS, serve_http, serve_workers
 from atlassian_mcp.server import main as server_main
 
 
@@ -24,6 +25,10 @@ Environment Variables:
 Examples:
   atlassian-mcp                    # Start the MCP server
   python -m atlassian_mcp          # Alternative way to start
+  atlassian-mcp --transport streamable-http --port 8000
+                                   # Serve many clients at http://127.0.0.1:8000/mcp
+  atlassian-mcp --transport streamable-http --workers 4
+                                   # Spread sessions across 4 worker processes
         """
     )
     parser.add_argument(
@@ -36,6 +41,31 @@ Examples:
         action="store_true",
         help="Enable debug logging"
     )
+    parser.add_argument(
+        "--transport",
+        choices=("stdio",) + HTTP_TRANSPORTS,
+        default="stdio",
+        help="Serve one client over stdio (default) or many over HTTP"
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Address to listen on with an HTTP transport (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port to listen on with an HTTP transport (default: 8000)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for --transport streamable-http (default: 1); "
+             "rate and in-flight limits are split between them, and the "
+             "per-session call limit does not apply"
+    )
     return parser
 
 
@@ -43,13 +73,22 @@ def main():
     """Main entry point for the CLI."""
     parser = create_parser()
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.transport != "streamable-http":
+        parser.error("--workers requires --transport streamable-http")
 
     if args.debug:
         import logging
         logging.basicConfig(level=logging.DEBUG)
 
     try:
-        asyncio.run(server_main())
+        if args.transport == "stdio":
+            asyncio.run(server_main())
+        elif args.workers > 1:
+            serve_workers(args.host, args.port, args.workers)
+        else:
+            asyncio.run(serve_http(args.transport, args.host, args.port))
     except KeyboardInterrupt:
         print("\nServer stopped by user")
         sys.exit(0)
@@ -0,0 +1,240 @@
+"""Render Atlassian Document Format (ADF) trees as Markdown or plain text."""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from .markdown import MarkdownEmitter
+
+# Document formats accepted by the Jira tools; "adf" returns the raw JSON trees
+DOCUMENT_FORMATS = ("adf", "markdown", "text")
+
+# Nodes whose block children are separated by blank lines
+_BLOCK_CONTAINERS = {
+    "doc", "blockquote", "panel", "expand", "nestedExpand", "bodiedExtension",
+    "layoutSection", "layoutColumn", "mediaGroup", "mediaSingle",
+}
+
+# Panel types rendered as the callout label
+_PANEL_LABELS = {
+    "info": "Info",
+    "note": "Note",
+    "warning": "Warning",
+    "error": "Error",
+    "success": "Success",
+    "tip": "Tip",
+}
+
+def is_document(value: Any) -> bool:
+    """Return True if value looks like the root of an ADF document."""
+    return (isinstance(value, dict) and value.get("type") == "doc"
+            and isinstance(value.get("content"), list))
+
+
+class ADFRenderer(MarkdownEmitter):
+    """Renders one ADF tree without recursion.
+
+    Nodes are visited with an explicit stack of (node, rendered children)
+    frames; a node is rendered once all of its children have been, so
+    arbitrarily deep documents cannot hit the recursion limit.
+    """
+
+    def __init__(self, mode: str = "markdown"):
+        if mode not in ("markdown", "text"):
+            raise ValueError(f"Unknown render mode: {mode}")
+        self.markdown = mode == "markdown"
+
+    def render(self, document: Dict[str, Any]) -> str:
+        """Return the Markdown or plain text for a document."""
+        root: List[str] = []
+        stack: List[Tuple[Dict[str, Any], List[str], int]] = [(document, root, 0)]
+        # Frames are (node, rendered children, index of the next child)
+        frames: List[Tuple[Dict[str, Any], List[str]]] = []
+        parents: List[List[str]] = []
+        while stack:
+            node, out, index = stack.pop()
+            if index == 0:
+                frames.append((node, []))
+                parents.append(out)
+            children = node.get("content") if isinstance(node, dict) else None
+            if isinstance(children, list) and index < len(children):
+                stack.append((node, out, index + 1))
+                child = children[index]
+                if isinstance(child, dict):
+                    stack.append((child, frames[-1][1], 0))
+                continue
+            current, parts = frames.pop()
+            parents.pop().append(self._render(current, parts))
+
+        return self._finish("".join(root))
+
+    # Node rendering
+    def _render(self, node: Dict[str, Any], parts: List[str]) -> str:
+        kind = node.get("type")
+        attrs = node.get("attrs") or {}
+
+        if kind == "text":
+            return self._text(node.get("text", ""), node.get("marks") or [])
+        if kind == "hardBreak":
+            return "\n"
+        if kind == "paragraph":
+            return self._block("".join(parts))
+        if kind == "heading":
+            return self._heading(int(attrs.get("level", 1)), "".join(parts))
+        if kind in ("bulletList", "orderedList", "taskList", "decisionList"):
+            return self._list(node, parts)
+        if kind in ("listItem", "taskItem", "decisionItem"):
+            return "".join(parts)
+        if kind in ("tableHeader", "tableCell"):
+            return self._cell("".join(parts))
+        if kind == "tableRow":
+            return " | ".join(parts)
+        if kind == "table":
+            return self._table(node, parts)
+        if kind == "codeBlock":
+            return self._code_block("".join(parts), attrs.get("language") or "")
+        if kind == "blockquote":
+            return self._quote("".join(parts))
+        if kind == "panel":
+            label = _PANEL_LABELS.get(attrs.get("panelType"), "Panel")
+            return self._callout(label, "".join(parts))
+        if kind in ("expand", "nestedExpand"):
+            title = attrs.get("title") or ""
+            return self._callout(f"Expand: {title}" if title else "Expand", "".join(parts))
+        if kind == "rule":
+            return self._block("---" if self.markdown else "")
+        if kind == "mention":
+            text = attrs.get("text") or attrs.get("id") or ""
+            return text if text.startswith("@") else f"@{text}"
+        if kind == "emoji":
+            return attrs.get("text") or attrs.get("shortName") or ""
+        if kind == "date":
+            return self._date(attrs.get("timestamp"))
+        if kind == "status":
+            return f"[{attrs.get('text', '')}]"
+        if kind in ("inlineCard", "blockCard", "embedCard"):
+            url = attrs.get("url") or ""
+            text = f"<{url}>" if self.markdown and url else url
+            return text if kind == "inlineCard" else self._block(text)
+        if kind == "media":
+            name = attrs.get("alt") or attrs.get("id") or ""
+            return self._block(f"[attachment: {name}]") if name else ""
+        if kind in ("extension", "inlineExtension"):
+            return attrs.get("text") or ""
+        if kind == "placeholder":
+            return ""
+        if kind in _BLOCK_CONTAINERS:
+            return self._block("".join(parts))
+        return "".join(parts)
+
+    def _list(self, node: Dict[str, Any], parts: List[str]) -> str:
+        children = [child for child in node.get("content") or []
+                    if isinstance(child, dict)]
+        kind = node.get("type")
+        number = int((node.get("attrs") or {}).get("order") or 1)
+        items = []
+        for child, content in zip(children, parts):
+            if kind == "orderedList":
+                marker = f"{number}. "
+                number += 1
+            elif kind == "taskList" and self.markdown:
+                done = (child.get("attrs") or {}).get("state") == "DONE"
+                marker = "- [x] " if done else "- [ ] "
+            else:
+                marker = "- "
+            items.append(self._item(marker, content))
+        return self._block("\n".join(item for item in items if item))
+
+    def _table(self, node: Dict[str, Any], rows: List[str]) -> str:
+        children = [child for child in node.get("content") or []
+                    if isinstance(child, dict)]
+        if not rows:
+            return ""
+        widths = [len(child.get("content") or []) for child in children]
+        width = max(widths)
+        if not self.markdown:
+            return self._block("\n".join(rows))
+
+        lines = []
+        for row, cells in zip(rows, widths):
+            lines.append("| " + row + " |" + " |" * (width - cells))
+            if len(lines) == 1:
+                lines.append("|" + "---|" * width)
+        return self._block("\n".join(lines))
+
+    def _text(self, text: str, marks: List[Dict[str, Any]]) -> str:
+        if not self.markdown or not marks or not text.strip():
+            return text
+        types = {mark.get("type"): mark.get("attrs") or {} for mark in marks}
+        # Keep surrounding spaces outside the markers
+        stripped = text.strip()
+        lead = " " if text[:1].isspace() else ""
+        trail = " " if text[-1:].isspace() else ""
+        if "code" in types:
+            stripped = f"`{stripped}`"
+        else:
+            if "strike" in types:
+                stripped = f"~~{stripped}~~"
+            if "em" in types:
+                stripped = f"*{stripped}*"
+            if "strong" in types:
+                stripped = f"**{stripped}**"
+        href = types.get("link", {}).get("href")
+        if href:
+            stripped = f"[{stripped}]({href})"
+        return f"{lead}{stripped}{trail}"
+
+    def _date(self, timestamp: Any) -> str:
+        try:
+            moment = datetime.fromtimestamp(int(timestamp) / 1000, tz=timezone.utc)
+        except (TypeError, ValueError, OverflowError, OSError):
+            return str(timestamp or "")
+        return moment.strftime("%Y-%m-%d")
+
+    def _callout(self, label: str, content: str) -> str:
+        heading = f"**{label}**" if self.markdown else label
+        body = content.strip()
+        return self._quote(f"{heading}\n\n{body}" if body else heading)
+
+
+def render_documents(value: Any, render: Callable[[str, Dict[str, Any]], str]) -> Any:
+    """Return a copy of value with every ADF document replaced by render(path, doc).
+
+    path is the dotted location of the document (e.g. "fields.description"
+    or "fields.comment.comments.0.body"). The input is never mutated; parts
+    of it without documents are shared with the copy.
+    """
+    if is_document(value):
+        return render("", value)
+    if not isinstance(value, (dict, list)):
+        return value
+
+    # Find the containers on a path to a document, deepest last
+    found: List[Tuple[Tuple[Any, ...], Any]] = []
+    stack: List[Tuple[Tuple[Any, ...], Any]] = [((), value)]
+    while stack:
+        path, node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, item in items:
+            if is_document(item):
+                found.append((path + (key,), item))
+            elif isinstance(item, (dict, list)):
+                stack.append((path + (key,), item))
+    if not found:
+        return value
+
+    root = _shallow_copy(value)
+    copies: Dict[Tuple[Any, ...], Any] = {(): root}
+    for path, document in found:
+        target = root
+        for depth in range(1, len(path)):
+            prefix = path[:depth]
+            if prefix not in copies:
+                copies[prefix] = _shallow_copy(target[path[depth - 1]])
+                target[path[depth - 1]] = copies[prefix]
+            target = copies[prefix]
+        target[path[-1]] = render(".".join(str(key) for key in path), document)
+    return root
+
+
+def _shallow_copy(value: Any) -> Any:
+    return dict(value) if isinstance(value, dict) else list(value)
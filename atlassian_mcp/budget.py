@@ -0,0 +1,289 @@
+"""Output budgets: token estimation, priority trimming and continuation cursors."""
+
+import base64
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Low-priority sections trimmed first when output exceeds its budget, in
+# order; lists lose their oldest (leading) entries
+TRIM_RULES: Tuple[Tuple[str, ...], ...] = (
+    ("changelog", "histories"),
+    ("fields", "attachment"),
+    ("fields", "worklog", "worklogs"),
+    ("fields", "comment", "comments"),
+    ("ancestors",),
+)
+
+# Main content cut from the end as a last resort, after trailing results of
+# a list have been dropped. "*" matches any key, e.g. the page body format;
+# "content" is the text of a page chunk.
+TRUNCATE_RULES: Tuple[Tuple[str, ...], ...] = (
+    ("fields", "description"),
+    ("body", "*", "value"),
+    ("content",),
+)
+
+# Keys under which batch tools nest each result
+_RECORD_KEYS = ("page", "issue")
+
+Path = List[Any]
+Size = Tuple[int, int]
+
+
+def estimate_tokens(text: str, size: Optional[int] = None) -> int:
+    """
+    Estimate the number of model tokens in text without a tokenizer.
+
+    Counts roughly four ASCII characters per token, the usual ratio for JSON
+    and English, and one token per non-ASCII character. size is the UTF-8
+    length of text when the caller already has it.
+    """
+    if size is None:
+        size = len(text.encode("utf-8"))
+    # Multi-byte characters add one to three extra bytes each
+    non_ascii = (size - len(text) + 1) // 2
+    return (len(text) - non_ascii + 3) // 4 + non_ascii
+
+
+def measure(text: str) -> Size:
+    """Return the estimated tokens and UTF-8 bytes of text."""
+    size = len(text.encode("utf-8"))
+    return estimate_tokens(text, size), size
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+class Budget:
+    """A limit on the estimated tokens and/or bytes of one tool response."""
+
+    def __init__(self, max_tokens: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        for name, limit in (("max_tokens", max_tokens), ("max_bytes", max_bytes)):
+            if limit is not None and limit <= 0:
+                raise ValueError(f"{name} must be a positive integer")
+        self.max_tokens = max_tokens
+        self.max_bytes = max_bytes
+
+    def fits(self, size: Size) -> bool:
+        """Return True if a measured size is within the budget."""
+        tokens, nbytes = size
+        return ((self.max_tokens is None or tokens <= self.max_tokens)
+                and (self.max_bytes is None or nbytes <= self.max_bytes))
+
+    def trim(self, value: Any) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        Fit a result into the budget by trimming low-priority sections.
+
+        Applies TRIM_RULES to the result (or to every result of a list),
+        then drops trailing list results, then applies TRUNCATE_RULES,
+        stopping as soon as the output fits. Returns the trimmed copy and the parts
+        that were left out, each {"path", "start", "stop"} slice of the
+        original value. The input is never mutated.
+        """
+        size = measure(_compact(value))
+        if self.fits(size):
+            return value, []
+
+        omitted: List[Dict[str, Any]] = []
+        value, size = self._trim_sections(value, TRIM_RULES, size, omitted)
+
+        if not self.fits(size) and isinstance(value, list) and len(value) > 1:
+            # Keep the leading results that fit, and at least one
+            sizes = [measure(_compact(item)) for item in value]
+            kept_tokens, kept_bytes, count = 1, 2, 0
+            for item_tokens, item_bytes in sizes:
+                if count and not self.fits(
+                        (kept_tokens + item_tokens + 1, kept_bytes + item_bytes + 1)):
+                    break
+                kept_tokens += item_tokens + 1
+                kept_bytes += item_bytes + 1
+                count += 1
+            if count < len(value):
+                # Dropped results are returned whole by the continuation
+                omitted[:] = [part for part in omitted if part["path"][0] < count]
+                omitted.append({"path": [], "start": count, "stop": None})
+                value = value[:count]
+                size = (kept_tokens, kept_bytes)
+
+        value, size = self._trim_sections(value, TRUNCATE_RULES, size, omitted)
+        return value, omitted
+
+    def _trim_sections(self, value: Any, rules: Tuple[Tuple[str, ...], ...],
+                       size: Size, omitted: List[Dict[str, Any]]) -> Tuple[Any, Size]:
+        """Trim the sections matched by rules, in order, until value fits."""
+        for rule in rules:
+            for path, section in list(_matches(value, rule)):
+                if self.fits(size):
+                    return value, size
+                old = measure(_compact(section))
+                if isinstance(section, list):
+                    kept, start = self._drop_oldest(section, size, old)
+                    part = {"path": path, "start": 0, "stop": start}
+                elif isinstance(section, str):
+                    kept, start = self._truncate(section, size, old)
+                    part = {"path": path, "start": start, "stop": None}
+                else:
+                    continue
+                if kept is section:
+                    continue
+                value = _replace(value, path, kept)
+                new = measure(_compact(kept))
+                size = (size[0] - old[0] + new[0], size[1] - old[1] + new[1])
+                omitted.append(part)
+        return value, size
+
+    def _drop_oldest(self, section: List[Any], size: Size,
+                     old: Size) -> Tuple[List[Any], int]:
+        """Drop leading list entries until the whole output fits."""
+        tokens, nbytes = size[0] - old[0], size[1] - old[1]
+        sizes = [measure(_compact(item)) for item in section]
+        remaining = (sum(t for t, _ in sizes) + len(sizes) + 1,
+                     sum(b for _, b in sizes) + len(sizes) + 1)
+        for start, (item_tokens, item_bytes) in enumerate(sizes):
+            if self.fits((tokens + remaining[0], nbytes + remaining[1])):
+                return (section[start:], start) if start else (section, 0)
+            remaining = (remaining[0] - item_tokens - 1,
+                         remaining[1] - item_bytes - 1)
+        return [], len(section)
+
+    def _truncate(self, section: str, size: Size, old: Size) -> Tuple[str, int]:
+        """Cut a string to the longest prefix that lets the output fit."""
+        base = (size[0] - old[0], size[1] - old[1])
+        low, high = 0, len(section)
+        while low < high:
+            middle = (low + high + 1) // 2
+            tokens, nbytes = measure(_compact(section[:middle]))
+            if self.fits((base[0] + tokens, base[1] + nbytes)):
+                low = middle
+            else:
+                high = middle - 1
+        return section[:low], low
+
+    def take(self, value: Any,
+             parts: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Return as much of the omitted parts of value as fits in the budget.
+
+        Each returned chunk is {"path", "start", "stop", "content"}. Always
+        returns at least one list entry or character so repeated calls make
+        progress; parts that did not fit are returned as the remainder.
+        """
+        chunks: List[Dict[str, Any]] = []
+        size = measure("[]")
+        remaining = list(parts)
+        while remaining:
+            part = remaining.pop(0)
+            section = _lookup(value, part["path"])
+            start, stop = part["start"], part["stop"]
+            if stop is None:
+                stop = len(section)
+            content = section[start:stop]
+            chunk = {"path": part["path"], "start": start, "stop": stop,
+                     "content": content}
+            chunk_size = measure(_compact(chunk))
+            total = (size[0] + chunk_size[0] + 1, size[1] + chunk_size[1] + 1)
+            if self.fits(total):
+                chunks.append(chunk)
+                size = total
+                continue
+
+            # Take the longest prefix of this part that fits
+            low, high = 0, len(content)
+            while low < high:
+                middle = (low + high + 1) // 2
+                chunk["content"] = content[:middle]
+                chunk_size = measure(_compact(chunk))
+                if self.fits((size[0] + chunk_size[0] + 1,
+                              size[1] + chunk_size[1] + 1)):
+                    low = middle
+                else:
+                    high = middle - 1
+            if low == 0 and chunks:
+                remaining.insert(0, part)
+                break
+            low = max(low, 1)
+            chunk["content"] = content[:low]
+            chunk["stop"] = start + low
+            chunks.append(chunk)
+            remaining.insert(0, {"path": part["path"], "start": start + low,
+                                 "stop": part["stop"]})
+            break
+        return chunks, remaining
+
+
+def _records(value: Any) -> Iterator[Tuple[Path, Any]]:
+    """Yield the individual results within a tool result with their paths."""
+    items = list(enumerate(value)) if isinstance(value, list) else [(None, value)]
+    for index, item in items:
+        prefix = [] if index is None else [index]
+        if isinstance(item, dict):
+            for key in _RECORD_KEYS:
+                if isinstance(item.get(key), dict):
+                    yield prefix + [key], item[key]
+                    break
+            else:
+                yield prefix, item
+
+
+def _matches(value: Any, rule: Tuple[str, ...]) -> Iterator[Tuple[Path, Any]]:
+    """Yield (path, section) for every section of value matched by a rule."""
+    for prefix, record in _records(value):
+        candidates = [(prefix, record)]
+        for key in rule:
+            matched = []
+            for path, node in candidates:
+                if not isinstance(node, dict):
+                    continue
+                keys = list(node) if key == "*" else [key]
+                matched.extend((path + [k], node[k]) for k in keys if k in node)
+            candidates = matched
+        yield from candidates
+
+
+def _lookup(value: Any, path: Path) -> Any:
+    for key in path:
+        value = value[key]
+    return value
+
+
+def _replace(root: Any, path: Path, new: Any) -> Any:
+    """Return a copy of root with the value at path replaced by new."""
+    if not path:
+        return new
+    copy = dict(root) if isinstance(root, dict) else list(root)
+    copy[path[0]] = _replace(root[path[0]], path[1:], new)
+    return copy
+
+
+def digest(value: Any) -> str:
+    """Return a short hash identifying the content of a tool result."""
+    data = json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(tool: str, parts: List[Dict[str, Any]], version: str) -> str:
+    """
+    Encode the omitted parts of a tool result as an opaque cursor.
+
+    version is the digest of the full result the parts refer to, so a
+    continuation can tell whether the result has changed since.
+    """
+    data = _compact({"tool": tool, "version": version, "parts": parts}).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def decode_cursor(cursor: str, tool: str) -> Tuple[List[Dict[str, Any]], str]:
+    """Decode a cursor produced by encode_cursor for the same tool into (parts, version)."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        owner, version, parts = data["tool"], data["version"], data["parts"]
+        for part in parts:
+            part["path"], part["start"], part["stop"]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError("Invalid cursor")
+    if owner != tool:
+        raise ValueError(f"Cursor was issued by {owner}, not {tool}")
+    return parts, version
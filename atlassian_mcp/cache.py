@@ -0,0 +1,513 @@
+"""Response cache for Atlassian API GET requests."""
+
+import asyncio
+import json
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlencode
+
+from .database import default_path, open_database
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Default location of the disk cache database
+DEFAULT_CACHE_PATH = default_path("cache.db")
+
+# Cache backends selectable in the configuration
+CACHE_BACKENDS = ("memory", "disk")
+
+# Default time-to-live in seconds for each cached endpoint
+DEFAULT_TTLS: Dict[str, float] = {
+    "confluence_page": 300.0,
+    "confluence_search": 30.0,
+    "confluence_spaces": 600.0,
+    "jira_issue": 60.0,
+    "jira_search": 30.0,
+    "jira_projects": 600.0,
+}
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body with its freshness and version metadata."""
+    value: Any
+    size: int
+    expires_at: float
+    version: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Return If-None-Match/If-Modified-Since headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def is_fresh(self) -> bool:
+        """Return True if the entry has not yet reached its TTL."""
+        return time.monotonic() < self.expires_at
+
+
+class CacheBackend:
+    """Storage interface for the response cache."""
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry stored under key, or None."""
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry under key, evicting others if needed."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under key, if any."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        raise NotImplementedError
+
+    # Called from the event loop; backends that block override these
+    async def get_async(self, key: str) -> Optional[CacheEntry]:
+        """Like get, without blocking the event loop."""
+        return self.get(key)
+
+    async def set_async(self, key: str, entry: CacheEntry) -> None:
+        """Like set, without blocking the event loop."""
+        self.set(key, entry)
+
+    async def delete_async(self, key: str) -> None:
+        """Like delete, without blocking the event loop."""
+        self.delete(key)
+
+    async def clear_async(self) -> None:
+        """Like clear, without blocking the event loop."""
+        self.clear()
+
+    async def stats_async(self) -> Dict[str, Any]:
+        """Like stats, without blocking the event loop."""
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return backend size and eviction statistics."""
+        return {}
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache bounded by the total size of stored responses."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        # An entry larger than the whole budget would evict everything else
+        # and then itself, so it is not stored at all
+        if entry.size > self.max_bytes:
+            self.delete(key)
+            return
+
+        self.delete(key)
+        self._entries[key] = entry
+        self.current_bytes += entry.size
+
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.size
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+_DISK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed REAL NOT NULL,
+    version TEXT,
+    etag TEXT,
+    last_modified TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, bytes) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET bytes = bytes + new.stored WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET bytes = bytes - old.stored WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF stored ON entries BEGIN
+    UPDATE totals SET bytes = bytes - old.stored + new.stored WHERE id = 0;
+END;
+"""
+
+# Entries evicted per batch when the disk cache is over its size limit
+_EVICT_BATCH = 64
+
+
+class DiskCache(CacheBackend):
+    """SQLite cache shared by every server process on a host.
+
+    Responses are stored as zlib-compressed compact JSON and survive
+    restarts. Each process opens its own connection; WAL mode lets readers
+    proceed while another process writes. A write waits up to busy_timeout
+    seconds for the lock and is dropped if it does not get it; recency
+    updates on reads are skipped whenever the lock is taken. The total
+    compressed size is kept in a trigger-maintained counter, and least
+    recently used entries are evicted once it exceeds max_bytes.
+
+    The async methods run the queries, compression and decoding on a
+    dedicated thread, so the event loop never waits on the database.
+
+    Expiry times are converted between this process's monotonic clock and
+    wall-clock time, since monotonic readings are not comparable across
+    processes. Stored values must be JSON-serializable.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 busy_timeout: float = 1.0):
+        self.path, self.db = open_database(path, _DISK_SCHEMA, timeout=busy_timeout,
+                                           check_same_thread=False)
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.max_bytes = max_bytes
+        self.busy_timeout = busy_timeout
+        self.evictions = 0
+        self.busy_skips = 0
+        # One thread keeps the connection's transactions from interleaving
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="atlassian-cache")
+
+    def close(self) -> None:
+        """Close the database."""
+        self._executor.shutdown(wait=True)
+        self.db.close()
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, function, *args)
+
+    async def get_async(self, key: str) -> Optional[CacheEntry]:
+        return await self._run(self.get, key)
+
+    async def set_async(self, key: str, entry: CacheEntry) -> None:
+        await self._run(self.set, key, entry)
+
+    async def delete_async(self, key: str) -> None:
+        await self._run(self.delete, key)
+
+    async def clear_async(self) -> None:
+        await self._run(self.clear)
+
+    async def stats_async(self) -> Dict[str, Any]:
+        return await self._run(self.stats)
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if orjson is not None:
+            try:
+                data = orjson.dumps(value)
+            except TypeError:
+                data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        else:
+            data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(data, 1)
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        data = zlib.decompress(blob)
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self.db.execute(
+            "SELECT value, size, expires_at, version, etag, last_modified "
+            "FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        blob, size, expires_at, version, etag, last_modified = row
+        # Recency is best-effort: skip the update rather than wait for the lock
+        self.db.execute("PRAGMA busy_timeout = 0")
+        try:
+            self.db.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.OperationalError:
+            self.busy_skips += 1
+        finally:
+            self.db.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+        return CacheEntry(
+            value=self._decode(blob),
+            size=size,
+            expires_at=expires_at - time.time() + time.monotonic(),
+            version=version,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        blob = self._encode(entry.value)
+        # The limit counts compressed bytes; a blob over it would push every
+        # other row out before being evicted itself, so skip the write lock
+        if len(blob) > self.max_bytes:
+            self.delete(key)
+            return
+
+        now = time.time()
+        expires_at = entry.expires_at - time.monotonic() + now
+        try:
+            self.db.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            # Another process kept the write lock; the cache is best-effort
+            self.busy_skips += 1
+            return
+        with self.db:
+            self.db.execute(
+                "INSERT INTO entries (key, value, size, stored, expires_at, accessed, "
+                "version, etag, last_modified) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+                "size = excluded.size, stored = excluded.stored, "
+                "expires_at = excluded.expires_at, accessed = excluded.accessed, "
+                "version = excluded.version, etag = excluded.etag, "
+                "last_modified = excluded.last_modified",
+                (key, blob, entry.size, len(blob), min(expires_at, 1e18), now,
+                 entry.version, entry.etag, entry.last_modified))
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the total fits."""
+        while True:
+            total, = self.db.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()
+            if total <= self.max_bytes:
+                return
+            excess = total - self.max_bytes
+            victims = []
+            for key, stored in self.db.execute(
+                    "SELECT key, stored FROM entries ORDER BY accessed LIMIT ?",
+                    (_EVICT_BATCH,)):
+                victims.append((key,))
+                excess -= stored
+                if excess <= 0:
+                    break
+            if not victims:
+                return
+            self.db.executemany("DELETE FROM entries WHERE key = ?", victims)
+            self.evictions += len(victims)
+
+    def delete(self, key: str) -> None:
+        self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self.db.execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self.db.execute(
+            "SELECT count(*), coalesce(sum(size), 0) FROM entries").fetchone()
+        stored, = self.db.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()
+        return {
+            "backend": "disk",
+            "path": self.path,
+            "entries": entries,
+            "bytes": stored,
+            "uncompressed_bytes": size,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "busy_skips": self.busy_skips,
+        }
+
+
+class ResponseCache:
+    """Cache front-end with per-endpoint TTLs and hit/miss counters.
+
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttls: Optional[Dict[str, float]] = None,
+    ):
+        self.backend = backend or MemoryCache()
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.invalidated = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key from a URL and its query parameters."""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def ttl(self, endpoint: str) -> float:
+        """Return the TTL for an endpoint; zero disables caching for it."""
+        return self.ttls.get(endpoint, 0.0)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry stored under key, fresh or stale."""
+        return await self.backend.get_async(key)
+
+    async def store(
+        self,
+        endpoint: str,
+        key: str,
+        value: Any,
+        size: int,
+        version: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CacheEntry:
+        """Store a response body with the endpoint's TTL."""
+        entry = CacheEntry(
+            value=value,
+            size=size,
+            expires_at=time.monotonic() + self.ttl(endpoint),
+            version=version,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        await self.backend.set_async(key, entry)
+        return entry
+
+    async def refresh(self, endpoint: str, key: str, entry: CacheEntry) -> None:
+        """Extend a stale entry's lifetime after a successful revalidation."""
+        entry.expires_at = time.monotonic() + self.ttl(endpoint)
+        await self.backend.set_async(key, entry)
+
+    async def invalidate(self, key: str) -> None:
+        """Drop the entry stored under key."""
+        await self.backend.delete_async(key)
+
+    async def clear(self) -> None:
+        """Drop all cached entries."""
+        await self.backend.clear_async()
+
+    async def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters together with backend statistics."""
+        backend = await self.backend.stats_async()
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "invalidated": self.invalidated,
+            "not_modified": self.not_modified,
+            "bytes_saved": self.bytes_saved,
+            "hit_ratio": (self.hits + self.revalidated) / lookups if lookups else 0.0,
+            "ttls": self.ttls,
+            **backend,
+        }
+
+
+class VersionedCache:
+    """Cache for values derived from a versioned resource.
+
+    Each key holds the value computed for one version of its source; a
+    lookup with a different version recomputes and replaces it, so stale
+    conversions never outlive the content they came from.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend or MemoryCache()
+
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_compute_async(
+        self,
+        key: str,
+        version: Optional[str],
+        compute: Callable[[], Awaitable[Any]],
+        size_of: Callable[[Any], int] = len,
+    ) -> Any:
+        """Return the value cached for key at version, awaiting compute() on a miss.
+
+        Values without a version are computed every time and not stored.
+        """
+        entry = self.lookup(key, version)
+        if entry is not None:
+            return entry.value
+        value = await compute()
+        self.put(key, version, value, size_of)
+        return value
+
+    def lookup(self, key: str, version: Optional[str]) -> Optional[CacheEntry]:
+        """Return the entry for key if it was computed at version, counting the lookup."""
+        entry = self.backend.get(key) if version is not None else None
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def put(self, key: str, version: Optional[str], value: Any,
+            size_of: Callable[[Any], int] = len) -> None:
+        """Store the value computed for key at version; unversioned values are dropped."""
+        if version is None:
+            return
+        self.backend.set(key, CacheEntry(
+            value=value,
+            size=size_of(value),
+            expires_at=float("inf"),
+            version=version,
+        ))
+
+    def clear(self) -> None:
+        """Drop all cached values."""
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters together with backend statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            **self.backend.stats(),
+        }
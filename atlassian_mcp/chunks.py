@@ -0,0 +1,109 @@
+"""Split converted page bodies into stable, heading-aligned chunks."""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Default maximum size of a chunk in characters
+DEFAULT_CHUNK_CHARS = 8000
+
+_HEADING = re.compile(r"^(#{1,6}) +(.*)$")
+_FENCE = re.compile(r"^(`{3,}|~{3,})")
+
+
+def _sections(markdown: str) -> List[Tuple[Optional[str], int, str]]:
+    """Split Markdown into (heading, level, text) sections at each heading.
+
+    Lines inside fenced code blocks are never treated as headings. Text
+    before the first heading forms a section with no heading.
+    """
+    sections: List[Tuple[Optional[str], int, str]] = []
+    heading: Optional[str] = None
+    level = 0
+    lines: List[str] = []
+    fence: Optional[str] = None
+    for line in markdown.split("\n"):
+        match = _FENCE.match(line)
+        if match:
+            if fence is None:
+                fence = match.group(1)[0] * len(match.group(1))
+            elif line.startswith(fence):
+                fence = None
+        elif fence is None:
+            match = _HEADING.match(line)
+            if match:
+                if lines or heading is not None:
+                    sections.append((heading, level, "\n".join(lines).strip("\n")))
+                heading, level, lines = match.group(2).strip(), len(match.group(1)), [line]
+                continue
+        lines.append(line)
+    if lines or heading is not None:
+        sections.append((heading, level, "\n".join(lines).strip("\n")))
+    return [section for section in sections if section[2]]
+
+
+def _split_large(text: str, max_chars: int) -> List[str]:
+    """Split an oversized section at blank lines, then at max_chars."""
+    pieces: List[str] = []
+    current = ""
+    for block in text.split("\n\n"):
+        candidate = f"{current}\n\n{block}" if current else block
+        if len(candidate) <= max_chars:
+            current = candidate
+            continue
+        if current:
+            pieces.append(current)
+        while len(block) > max_chars:
+            pieces.append(block[:max_chars])
+            block = block[max_chars:]
+        current = block
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_markdown(markdown: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[Dict[str, Any]]:
+    """
+    Split a Markdown document into chunks of at most max_chars characters.
+
+    Chunks start at headings: consecutive sections are packed together while
+    they fit, a section that is too large on its own is split at paragraph
+    boundaries, and a new top-level (#/##) section always starts a new chunk
+    once the current one is half full. The same document always produces the
+    same chunks. Each chunk is {"index", "heading", "headings", "content"}.
+    """
+    if max_chars <= 0:
+        raise ValueError("max_chars must be a positive integer")
+
+    chunks: List[Dict[str, Any]] = []
+    current: List[str] = []
+    headings: List[str] = []
+    size = 0
+
+    def flush() -> None:
+        nonlocal current, headings, size
+        if current:
+            chunks.append({
+                "index": len(chunks),
+                "heading": headings[0] if headings else None,
+                "headings": headings,
+                "content": "\n\n".join(current),
+            })
+        current, headings, size = [], [], 0
+
+    for heading, level, text in _sections(markdown):
+        pieces = _split_large(text, max_chars) if len(text) > max_chars else [text]
+        for number, piece in enumerate(pieces):
+            added = len(piece) + (2 if current else 0)
+            major = number == 0 and level in (1, 2) and size >= max_chars // 2
+            if current and (size + added > max_chars or major):
+                flush()
+                added = len(piece)
+            current.append(piece)
+            if number == 0 and heading is not None:
+                headings.append(heading)
+            elif not headings and heading is not None:
+                # A continuation chunk is still labelled with its section
+                headings.append(heading)
+            size += added
+    flush()
+    return chunks
@@ -1,14 +1,112 @@
 """Atlassian API client for Confluence and Jira."""
 
+import asyncio
 import base64
+import logging
 import os
 import re
-from typing import Any, Dict, List, Optional
-from urllib.parse import parse_qs, urlparse
+from typing import (Any, AsyncIterator, Awaitable, Callable, Dict, List,
+                    Optional, Tuple)
+from urllib.parse import parse_qs, urlencode, urlparse
 
 import httpx
 from pydantic import BaseModel
 
+from .adf import DOCUMENT_FORMATS, ADFRenderer, render_documents
+from .cache import (CACHE_BACKENDS, DEFAULT_CACHE_PATH, CacheBackend, DiskCache,
+                    MemoryCache, ResponseCache, VersionedCache)
+from .chunks import DEFAULT_CHUNK_CHARS, chunk_markdown
+from .coalesce import SingleFlight
+from .index import (DEFAULT_INDEX_PATH, PageIndex, fts5_available, index_spaces,
+                    match_expression)
+from .mirror import DEFAULT_MIRROR_PATH, IssueStore, JiraMirror
+from .offload import DEFAULT_OFFLOAD_THRESHOLD, LoopLagMonitor, Offloader
+from .retry import RETRY_STATUSES, RetryPolicy
+from .scheduler import RequestScheduler
+from .storage import BODY_FORMATS, convert_storage
+from .sync import ConfluenceSync
+from .throttle import Throttle
+from .transport import ConnectionStats, ProductClient, create_http_client
+
+logger = logging.getLogger(__name__)
+
+# Largest pages the Confluence and Jira collection endpoints will return
+CONFLUENCE_MAX_PAGE_SIZE = 100
+JIRA_MAX_PAGE_SIZE = 100
+
+# Jira issue keys accepted by batch reads, which splice them into JQL
+JIRA_ISSUE_KEY = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+
+# Field/expand profiles for Jira issue reads. A fields value of None leaves the
+# Jira default (all fields for a single issue, navigable fields for a search).
+_JIRA_SUMMARY_FIELDS = [
+    "summary", "status", "issuetype", "priority", "assignee", "reporter",
+    "project", "labels", "created", "updated",
+]
+
+JIRA_PROFILES: Dict[str, Dict[str, Dict[str, Optional[List[str]]]]] = {
+    "summary": {
+        "issue": {"fields": _JIRA_SUMMARY_FIELDS + ["description"], "expand": []},
+        "search": {"fields": _JIRA_SUMMARY_FIELDS, "expand": []},
+    },
+    "full": {
+        "issue": {"fields": None, "expand": ["changelog", "attachments", "comments"]},
+        "search": {"fields": None, "expand": ["changelog"]},
+    },
+}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer from the environment."""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float from the environment."""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+def _env_list(name: str) -> Optional[List[str]]:
+    """Read a comma-separated list from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _env_mapping(name: str) -> Dict[str, float]:
+    """Read a comma-separated list of key=number pairs from the environment."""
+    value = os.getenv(name)
+    if not value:
+        return {}
+    mapping = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        key, _, number = item.partition("=")
+        mapping[key.strip()] = float(number)
+    return mapping
+
+
+def _render_all(documents: Dict[str, Dict[str, Any]], mode: str) -> Dict[str, str]:
+    """Render ADF documents keyed by path (run inline or in the offload executor)."""
+    renderer = ADFRenderer(mode)
+    return {path: renderer.render(document) for path, document in documents.items()}
+
 
 class AtlassianConfig(BaseModel):
     """Configuration for Atlassian API access."""
@@ -17,6 +115,105 @@ class AtlassianConfig(BaseModel):
     confluence_token: Optional[str] = None
     jira_token: Optional[str] = None
 
+    # Response cache. The "disk" backend persists responses in a SQLite
+    # database (cache_path) shared by every server process on the host;
+    # cache_max_bytes then bounds its compressed size.
+    cache_enabled: bool = True
+    cache_backend: str = "memory"
+    cache_path: Optional[str] = None
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_ttls: Dict[str, float] = {}
+
+    # Default Confluence page body format ("storage", "markdown" or "text")
+    # and the size of the cache holding converted bodies
+    confluence_body_format: str = "storage"
+    conversion_cache_max_bytes: int = 16 * 1024 * 1024
+
+    # Maximum size in characters of a page chunk returned by
+    # confluence_get_page_chunk
+    confluence_chunk_chars: int = DEFAULT_CHUNK_CHARS
+
+    # Spaces kept in the local full-text search index ("*" for all spaces;
+    # None disables the index) and the index database location
+    search_index_spaces: Optional[List[str]] = None
+    search_index_path: Optional[str] = None
+
+    # Search index sync: seconds between change polls, concurrent page
+    # fetches, how far each poll reaches back before its checkpoint, and
+    # seconds between full reconciliations that catch deleted pages
+    sync_interval: float = 300.0
+    sync_concurrency: int = 4
+    sync_overlap: float = 86400.0
+    sync_reconcile_interval: float = 86400.0
+
+    # Default Jira field/expand profile ("summary" or "full")
+    jira_profile: str = "summary"
+
+    # Default format for Jira rich-text fields ("adf", "markdown" or "text")
+    jira_body_format: str = "adf"
+
+    # Jira projects mirrored locally (None disables the mirror), the mirror
+    # database location, seconds between change polls, and the maximum age
+    # in seconds of a project's last sync for reads to be served locally.
+    # The mirror shares sync_overlap and sync_reconcile_interval.
+    jira_mirror_projects: Optional[List[str]] = None
+    jira_mirror_path: Optional[str] = None
+    jira_mirror_interval: float = 60.0
+    jira_mirror_max_staleness: float = 300.0
+
+    # Share one request among concurrent identical GETs
+    coalesce_requests: bool = True
+
+    # Executor for JSON decoding, body conversion and serialization of
+    # payloads of at least offload_threshold_bytes ("thread", "process" to
+    # decode JSON in worker processes, or "none")
+    offload_executor: str = "thread"
+    offload_threshold_bytes: int = DEFAULT_OFFLOAD_THRESHOLD
+    offload_workers: int = 4
+
+    # Maximum concurrent requests issued by a single batch tool call
+    batch_concurrency: int = 8
+
+    # Maximum in-flight requests per product across all tool calls
+    confluence_max_in_flight: int = 10
+    jira_max_in_flight: int = 10
+
+    # Maximum concurrent tool calls per client session when serving over
+    # HTTP (0 disables the limit)
+    session_max_concurrency: int = 4
+
+    # Retries for rate-limited or failed GETs
+    retry_max_attempts: int = 4
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 30.0
+    retry_budget_ratio: float = 0.2
+
+    # Client-side request rate per product (requests/second, 0 disables)
+    confluence_rate_limit: float = 10.0
+    jira_rate_limit: float = 10.0
+    rate_limit_burst: float = 20.0
+
+    # Server processes sharing the rate and in-flight limits above; each
+    # process enforces an equal share of them (set by --workers)
+    worker_processes: int = 1
+
+    # Tool output ("compact" or "pretty") and JSON backend ("auto", "json", "orjson")
+    output_format: str = "compact"
+    json_backend: str = "auto"
+
+    # Keys stripped from tool output at every level (None keeps the defaults)
+    slim_output: bool = True
+    slim_keys: Optional[List[str]] = None
+
+    # HTTP transport
+    http2: bool = True
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+    pool_timeout: float = 30.0
+
     @classmethod
     def from_env(cls) -> "AtlassianConfig":
         """Create configuration from environment variables."""
@@ -47,7 +244,64 @@ class AtlassianConfig(BaseModel):
             domain=domain,
             email=email,
             confluence_token=confluence_token,
-            jira_token=jira_token
+            jira_token=jira_token,
+            cache_enabled=_env_bool("ATLASSIAN_CACHE_ENABLED", True),
+            cache_backend=os.getenv("ATLASSIAN_CACHE_BACKEND") or "memory",
+            cache_path=os.getenv("ATLASSIAN_CACHE_PATH") or None,
+            cache_max_bytes=_env_int(
+                "ATLASSIAN_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+            cache_ttls=_env_mapping("ATLASSIAN_CACHE_TTLS"),
+            confluence_body_format=(
+                os.getenv("ATLASSIAN_CONFLUENCE_BODY_FORMAT") or "storage"),
+            conversion_cache_max_bytes=_env_int(
+                "ATLASSIAN_CONVERSION_CACHE_MAX_BYTES", 16 * 1024 * 1024),
+            confluence_chunk_chars=_env_int(
+                "ATLASSIAN_CONFLUENCE_CHUNK_CHARS", DEFAULT_CHUNK_CHARS),
+            search_index_spaces=_env_list("ATLASSIAN_SEARCH_INDEX_SPACES"),
+            search_index_path=os.getenv("ATLASSIAN_SEARCH_INDEX_PATH") or None,
+            sync_interval=_env_float("ATLASSIAN_SYNC_INTERVAL", 300.0),
+            sync_concurrency=_env_int("ATLASSIAN_SYNC_CONCURRENCY", 4),
+            sync_overlap=_env_float("ATLASSIAN_SYNC_OVERLAP", 86400.0),
+            sync_reconcile_interval=_env_float(
+                "ATLASSIAN_SYNC_RECONCILE_INTERVAL", 86400.0),
+            jira_profile=os.getenv("ATLASSIAN_JIRA_PROFILE") or "summary",
+            jira_body_format=os.getenv("ATLASSIAN_JIRA_BODY_FORMAT") or "adf",
+            jira_mirror_projects=_env_list("ATLASSIAN_JIRA_MIRROR_PROJECTS"),
+            jira_mirror_path=os.getenv("ATLASSIAN_JIRA_MIRROR_PATH") or None,
+            jira_mirror_interval=_env_float("ATLASSIAN_JIRA_MIRROR_INTERVAL", 60.0),
+            jira_mirror_max_staleness=_env_float(
+                "ATLASSIAN_JIRA_MIRROR_MAX_STALENESS", 300.0),
+            coalesce_requests=_env_bool("ATLASSIAN_COALESCE_REQUESTS", True),
+            offload_executor=os.getenv("ATLASSIAN_OFFLOAD_EXECUTOR") or "thread",
+            offload_threshold_bytes=_env_int(
+                "ATLASSIAN_OFFLOAD_THRESHOLD_BYTES", DEFAULT_OFFLOAD_THRESHOLD),
+            offload_workers=_env_int("ATLASSIAN_OFFLOAD_WORKERS", 4),
+            batch_concurrency=_env_int("ATLASSIAN_BATCH_CONCURRENCY", 8),
+            confluence_max_in_flight=_env_int(
+                "ATLASSIAN_CONFLUENCE_MAX_IN_FLIGHT", 10),
+            jira_max_in_flight=_env_int("ATLASSIAN_JIRA_MAX_IN_FLIGHT", 10),
+            session_max_concurrency=_env_int("ATLASSIAN_SESSION_MAX_CONCURRENCY", 4),
+            retry_max_attempts=_env_int("ATLASSIAN_RETRY_MAX_ATTEMPTS", 4),
+            retry_base_delay=_env_float("ATLASSIAN_RETRY_BASE_DELAY", 0.5),
+            retry_max_delay=_env_float("ATLASSIAN_RETRY_MAX_DELAY", 30.0),
+            retry_budget_ratio=_env_float("ATLASSIAN_RETRY_BUDGET_RATIO", 0.2),
+            confluence_rate_limit=_env_float(
+                "ATLASSIAN_CONFLUENCE_RATE_LIMIT", 10.0),
+            jira_rate_limit=_env_float("ATLASSIAN_JIRA_RATE_LIMIT", 10.0),
+            rate_limit_burst=_env_float("ATLASSIAN_RATE_LIMIT_BURST", 20.0),
+            worker_processes=_env_int("ATLASSIAN_WORKER_PROCESSES", 1),
+            output_format=os.getenv("ATLASSIAN_OUTPUT_FORMAT") or "compact",
+            json_backend=os.getenv("ATLASSIAN_JSON_BACKEND") or "auto",
+            slim_output=_env_bool("ATLASSIAN_SLIM_OUTPUT", True),
+            slim_keys=_env_list("ATLASSIAN_SLIM_KEYS"),
+            http2=_env_bool("ATLASSIAN_HTTP2", True),
+            max_connections=_env_int("ATLASSIAN_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=_env_int(
+                "ATLASSIAN_MAX_KEEPALIVE_CONNECTIONS", 10),
+            keepalive_expiry=_env_float("ATLASSIAN_KEEPALIVE_EXPIRY", 60.0),
+            connect_timeout=_env_float("ATLASSIAN_CONNECT_TIMEOUT", 10.0),
+            read_timeout=_env_float("ATLASSIAN_READ_TIMEOUT", 30.0),
+            pool_timeout=_env_float("ATLASSIAN_POOL_TIMEOUT", 30.0),
         )
 
 
@@ -58,40 +312,395 @@ class AtlassianClient:
         self.config = config
         self.base_url = f"https://{config.domain}"
 
-        # Create separate clients for Confluence and Jira if tokens are available
-        self.confluence_client = None
-        self.jira_client = None
+        # Connection reuse statistics gathered from httpcore trace events
+        self.connections = ConnectionStats()
+
+        # One connection pool for the domain; each product attaches its own
+        # credentials per request
+        self.http_client = create_http_client(
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json"
+            },
+            http2=config.http2,
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+            connect_timeout=config.connect_timeout,
+            read_timeout=config.read_timeout,
+            write_timeout=config.read_timeout,
+            pool_timeout=config.pool_timeout,
+        )
+
+        # Create product clients for Confluence and Jira if tokens are available
+        self.confluence_client: Optional[ProductClient] = None
+        self.jira_client: Optional[ProductClient] = None
 
         if config.confluence_token:
             confluence_auth = f"{config.email}:{config.confluence_token}"
             confluence_auth_b64 = base64.b64encode(
                 confluence_auth.encode('ascii')).decode('ascii')
-            confluence_headers = {
-                "Authorization": f"Basic {confluence_auth_b64}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            }
-            self.confluence_client = httpx.AsyncClient(
-                headers=confluence_headers, timeout=30.0)
+            self.confluence_client = ProductClient(
+                "confluence", self.http_client,
+                {"Authorization": f"Basic {confluence_auth_b64}"})
 
         if config.jira_token:
             jira_auth = f"{config.email}:{config.jira_token}"
             jira_auth_b64 = base64.b64encode(
                 jira_auth.encode('ascii')).decode('ascii')
-            jira_headers = {
-                "Authorization": f"Basic {jira_auth_b64}",
-                "Accept": "application/json",
-                "Content-Type": "application/json"
-            }
-            self.jira_client = httpx.AsyncClient(
-                headers=jira_headers, timeout=30.0)
+            self.jira_client = ProductClient(
+                "jira", self.http_client,
+                {"Authorization": f"Basic {jira_auth_b64}"})
+
+        # Response cache shared by all GET methods
+        self.cache: Optional[ResponseCache] = None
+        if config.cache_enabled:
+            if config.cache_backend not in CACHE_BACKENDS:
+                raise ValueError(
+                    f"Unknown cache backend: {config.cache_backend}. "
+                    f"Expected one of: {', '.join(CACHE_BACKENDS)}")
+            backend: CacheBackend
+            if config.cache_backend == "disk":
+                backend = DiskCache(config.cache_path or DEFAULT_CACHE_PATH,
+                                    max_bytes=config.cache_max_bytes)
+            else:
+                backend = MemoryCache(max_bytes=config.cache_max_bytes)
+            self.cache = ResponseCache(backend, ttls=config.cache_ttls)
+
+        # Converted Confluence bodies and rendered Jira documents, keyed by
+        # resource and format and validated against the resource version
+        self.conversions = VersionedCache(
+            MemoryCache(max_bytes=config.conversion_cache_max_bytes))
+
+        # Optional local full-text index answering Confluence searches, kept
+        # current by the sync engine (started with sync.run())
+        self.search_index: Optional[PageIndex] = None
+        self.sync: Optional[ConfluenceSync] = None
+        if index_spaces(config.search_index_spaces) and config.confluence_token:
+            if fts5_available():
+                self.search_index = PageIndex(
+                    config.search_index_path or DEFAULT_INDEX_PATH)
+                self.sync = ConfluenceSync(
+                    self,
+                    self.search_index,
+                    config.search_index_spaces,
+                    interval=config.sync_interval,
+                    concurrency=config.sync_concurrency,
+                    overlap=config.sync_overlap,
+                    reconcile_interval=config.sync_reconcile_interval,
+                )
+            else:
+                logger.warning(
+                    "Search index configured but this SQLite build has no "
+                    "FTS5 support; searching remotely")
+
+        # Optional local mirror of Jira projects answering issue reads and
+        # simple JQL searches while fresh (synced with jira_mirror.run())
+        self.jira_mirror: Optional[JiraMirror] = None
+        if config.jira_mirror_projects and config.jira_token:
+            self.jira_mirror = JiraMirror(
+                self,
+                IssueStore(config.jira_mirror_path or DEFAULT_MIRROR_PATH),
+                config.jira_mirror_projects,
+                interval=config.jira_mirror_interval,
+                max_staleness=config.jira_mirror_max_staleness,
+                overlap=config.sync_overlap,
+                reconcile_interval=config.sync_reconcile_interval,
+            )
+
+        # In-flight GETs shared by concurrent callers asking for the same thing
+        self.single_flight = SingleFlight()
+
+        # Executor for CPU-heavy stages on large payloads, and a monitor of
+        # how long the event loop is blocked (started with loop_lag.run())
+        self.offload = Offloader(
+            config.offload_executor,
+            threshold=config.offload_threshold_bytes,
+            workers=config.offload_workers,
+        )
+        self.loop_lag = LoopLagMonitor()
+
+        # Upstream limits are per host; split them across worker processes
+        shares = max(config.worker_processes, 1)
+
+        # Per-product in-flight limits shared by all tool calls
+        self.scheduler = RequestScheduler({
+            "confluence": max(config.confluence_max_in_flight // shares, 1),
+            "jira": max(config.jira_max_in_flight // shares, 1),
+        })
+
+        # Retry policy and rate-limit state shared by both products
+        self.retry = RetryPolicy(
+            max_retries=config.retry_max_attempts,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay,
+            budget_ratio=config.retry_budget_ratio,
+        )
+
+        # Adaptive token buckets that smooth bursts before they reach the API
+        self.throttle = Throttle({
+            "confluence": config.confluence_rate_limit / shares,
+            "jira": config.jira_rate_limit / shares,
+        }, burst=config.rate_limit_burst / shares)
 
     async def close(self):
-        """Close the HTTP clients."""
-        if self.confluence_client:
-            await self.confluence_client.aclose()
-        if self.jira_client:
-            await self.jira_client.aclose()
+        """Close the shared HTTP client and the local databases."""
+        await self.http_client.aclose()
+        self.offload.close()
+        if self.cache is not None and isinstance(self.cache.backend, DiskCache):
+            self.cache.backend.close()
+        if self.search_index is not None:
+            self.search_index.close()
+        if self.jira_mirror is not None:
+            self.jira_mirror.store.close()
+
+    async def stats(self) -> Dict[str, Any]:
+        """Return runtime statistics for the client."""
+        return {
+            "cache": await self.cache.stats() if self.cache else None,
+            "conversions": self.conversions.stats(),
+            "search_index": self.search_index.stats() if self.search_index else None,
+            "sync": self.sync.stats() if self.sync else None,
+            "jira_mirror": self.jira_mirror.stats() if self.jira_mirror else None,
+            "coalescing": self.single_flight.stats(),
+            "offload": self.offload.stats(),
+            "event_loop": self.loop_lag.stats(),
+            "scheduler": self.scheduler.stats(),
+            "retry": self.retry.stats(),
+            "throttle": self.throttle.stats(),
+            "connections": self.connections.stats(),
+        }
+
+    # Request helpers
+    async def _fetch(self, http_client: ProductClient, url: str,
+                     params: Optional[Dict[str, Any]] = None,
+                     headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """Send a GET request and raise on HTTP errors.
+
+        Rate-limited (429), unavailable (502/503/504) and transport-failed
+        requests are retried according to the shared retry policy. A 304 Not
+        Modified is returned as-is when conditional headers were sent.
+        """
+        product = http_client.product
+        attempt = 0
+        while True:
+            await self.retry.wait_if_blocked()
+            await self.throttle.acquire(product)
+            self.retry.record_request()
+            try:
+                async with self.scheduler.slot(product):
+                    response = await http_client.get(
+                        url, params=params, headers=headers,
+                        extensions={"trace": self.connections.trace})
+            except httpx.TransportError:
+                delay = self.retry.backoff(attempt)
+                if delay is None:
+                    raise
+            else:
+                self.retry.observe(response)
+                self.throttle.observe(product, response)
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                delay = self.retry.backoff(attempt, response)
+                if delay is None:
+                    break
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        if response.status_code == 304 and headers:
+            return response
+        response.raise_for_status()
+        return response
+
+    async def _get(
+        self,
+        endpoint: str,
+        http_client: ProductClient,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        version_of: Optional[Callable[[Any], Optional[str]]] = None,
+        current_version: Optional[
+            Callable[[], Awaitable[Tuple[Optional[str], int]]]] = None,
+    ) -> Any:
+        """
+        GET a JSON resource, sharing the request with concurrent identical GETs.
+
+        Callers asking for the same URL and params while a request is in
+        flight await its result instead of sending their own; see _get_once.
+        """
+        if not self.config.coalesce_requests:
+            return await self._get_once(
+                endpoint, http_client, url, params, version_of, current_version)
+        return await self.single_flight.run(
+            ("GET", ResponseCache.make_key(url, params)),
+            lambda: self._get_once(
+                endpoint, http_client, url, params, version_of, current_version))
+
+    async def _get_once(
+        self,
+        endpoint: str,
+        http_client: ProductClient,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        version_of: Optional[Callable[[Any], Optional[str]]] = None,
+        current_version: Optional[
+            Callable[[], Awaitable[Tuple[Optional[str], int]]]] = None,
+    ) -> Any:
+        """
+        GET a JSON resource through the response cache.
+
+        Fresh entries are served directly. Stale entries are revalidated with a
+        conditional GET when the server supplied an ETag or Last-Modified
+        header, and otherwise with current_version(), which returns the
+        resource's current version and the size of the probe response. If the
+        resource is unchanged the cached body is reused, otherwise the full
+        resource is fetched again.
+        """
+        if self.cache is None or not self.cache.ttl(endpoint):
+            response = await self._fetch(http_client, url, params)
+            return await self.offload.json(response.content)
+
+        key = self.cache.make_key(url, params)
+        entry = await self.cache.get(key)
+        if entry is not None:
+            if entry.is_fresh():
+                self.cache.hits += 1
+                return entry.value
+
+            conditional_headers = entry.conditional_headers()
+            if conditional_headers:
+                response = await self._fetch(
+                    http_client, url, params, headers=conditional_headers)
+                if response.status_code == 304:
+                    self.cache.revalidated += 1
+                    self.cache.not_modified += 1
+                    self.cache.bytes_saved += entry.size
+                    entry.etag = response.headers.get("ETag", entry.etag)
+                    entry.last_modified = response.headers.get(
+                        "Last-Modified", entry.last_modified)
+                    await self.cache.refresh(endpoint, key, entry)
+                    return entry.value
+                self.cache.invalidated += 1
+                self.cache.misses += 1
+                return await self._store(endpoint, key, response, version_of)
+
+            if current_version is not None and entry.version is not None:
+                version, probe_size = await current_version()
+                if version == entry.version:
+                    self.cache.revalidated += 1
+                    self.cache.bytes_saved += max(entry.size - probe_size, 0)
+                    await self.cache.refresh(endpoint, key, entry)
+                    return entry.value
+                self.cache.invalidated += 1
+
+        self.cache.misses += 1
+        response = await self._fetch(http_client, url, params)
+        return await self._store(endpoint, key, response, version_of)
+
+    async def _store(
+        self,
+        endpoint: str,
+        key: str,
+        response: httpx.Response,
+        version_of: Optional[Callable[[Any], Optional[str]]] = None,
+    ) -> Any:
+        """Decode a response and store it in the cache with its validators."""
+        value = await self.offload.json(response.content)
+        await self.cache.store(
+            endpoint,
+            key,
+            value,
+            len(response.content),
+            version=version_of(value) if version_of else None,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return value
+
+    @staticmethod
+    def _confluence_version(page: Any) -> Optional[str]:
+        """Extract the version number from a Confluence content object."""
+        number = (page.get("version") or {}).get("number")
+        return str(number) if number is not None else None
+
+    @staticmethod
+    def _jira_version(issue: Any) -> Optional[str]:
+        """Extract the last-updated timestamp from a Jira issue."""
+        return (issue.get("fields") or {}).get("updated")
+
+    async def _confluence_current_version(
+            self, page_id: str) -> Tuple[Optional[str], int]:
+        """Fetch only the current version number of a Confluence page."""
+        url = f"{self.base_url}/wiki/rest/api/content/{page_id}"
+        response = await self._fetch(
+            self.confluence_client, url, {"expand": "version"})
+        return self._confluence_version(response.json()), len(response.content)
+
+    async def _jira_current_version(
+            self, issue_key: str) -> Tuple[Optional[str], int]:
+        """Fetch only the last-updated timestamp of a Jira issue."""
+        url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
+        response = await self._fetch(
+            self.jira_client, url, {"fields": "updated"})
+        return self._jira_version(response.json()), len(response.content)
+
+    async def _iter_pages(
+        self,
+        fetch: Callable[[Optional[Any]], Awaitable[Any]],
+        next_cursor: Callable[[Any, int], Optional[Any]],
+        items_key: str,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield items from a paginated endpoint, prefetching the next page.
+
+        fetch(cursor) returns a page (cursor is None for the first page) and
+        next_cursor(page, received) returns the cursor for the following page,
+        or None when there are no more pages. Page N+1 is requested while the
+        items of page N are being consumed; the walk stops once limit items
+        have been yielded.
+        """
+        yielded = 0
+        pending: Optional["asyncio.Future[Any]"] = asyncio.ensure_future(
+            fetch(None))
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+                items = data.get(items_key, [])
+
+                cursor = next_cursor(data, len(items)) if items else None
+                if cursor is not None and (
+                        limit is None or yielded + len(items) < limit):
+                    pending = asyncio.ensure_future(fetch(cursor))
+
+                for item in items:
+                    yield item
+                    yielded += 1
+                    if limit is not None and yielded >= limit:
+                        return
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _gather_bounded(self, items: List[Any],
+                              fetch: Callable[[Any], Awaitable[Any]]) -> List[Dict[str, Any]]:
+        """
+        Run fetch(item) for every item with bounded concurrency.
+
+        Returns one {"result": ...} or {"error": ...} dict per item, in order,
+        so a single failure does not fail the whole batch.
+        """
+        semaphore = asyncio.Semaphore(max(self.config.batch_concurrency, 1))
+
+        async def run(item: Any) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return {"result": await fetch(item)}
+                except Exception as e:
+                    return {"error": str(e)}
+
+        return await asyncio.gather(*(run(item) for item in items))
 
     # URL parsing utilities
     def parse_confluence_url(self, url: str) -> Optional[str]:
@@ -159,8 +768,23 @@ class AtlassianClient:
             return None
 
     # Confluence methods
-    async def confluence_get_page(self, page_id: str) -> Dict[str, Any]:
-        """Get a Confluence page by ID."""
+    async def confluence_get_page(
+        self,
+        page_id: str,
+        body_format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get a Confluence page by ID.
+
+        body_format selects how the page body is returned: "storage" (the raw
+        storage XHTML), "markdown" or "text". Converted bodies are cached per
+        page version.
+        """
+        body_format = body_format or self.config.confluence_body_format
+        if body_format not in BODY_FORMATS:
+            raise ValueError(
+                f"Unknown body format: {body_format}. "
+                f"Expected one of: {', '.join(BODY_FORMATS)}")
         if not self.confluence_client:
             raise ValueError(
                 "Confluence token not configured. Please set ATLASSIAN_CONFLUENCE_TOKEN.")
@@ -170,85 +794,543 @@ class AtlassianClient:
             "expand": "body.storage,space,version,ancestors"
         }
 
-        response = await self.confluence_client.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        page = await self._get(
+            "confluence_page", self.confluence_client, url, params,
+            version_of=self._confluence_version,
+            current_version=lambda: self._confluence_current_version(page_id),
+        )
+        if body_format == "storage":
+            return page
+        return await self._convert_page_body(page, body_format)
 
-    async def confluence_search_pages(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search for Confluence pages."""
-        if not self.confluence_client:
+    async def _convert_page_body(self, page: Dict[str, Any],
+                                 body_format: str) -> Dict[str, Any]:
+        """Return a copy of page with its storage body converted."""
+        storage = ((page.get("body") or {}).get("storage") or {}).get("value")
+        if storage is None:
+            return page
+        text = await self.conversions.get_or_compute_async(
+            f"confluence:{page.get('id')}:{body_format}",
+            self._confluence_version(page),
+            lambda: self.offload.run(len(storage), convert_storage, storage, body_format),
+        )
+        # The fetched page is shared with the response cache; never mutate it
+        return {
+            **page,
+            "body": {body_format: {"value": text, "representation": body_format}},
+        }
+
+    async def confluence_get_page_chunk(
+        self,
+        page_id: str,
+        chunk: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get one heading-aligned chunk of a Confluence page body as Markdown.
+
+        Without a chunk index, returns the page outline: every chunk's index,
+        headings and size. Chunks are computed from the Markdown body and
+        cached per page version, so indexes are stable until the page changes.
+        """
+        page = await self.confluence_get_page(page_id, "markdown")
+        chunks = await self._page_chunks(page)
+        summary = {
+            "id": page.get("id"),
+            "title": page.get("title"),
+            "version": self._confluence_version(page),
+        }
+        if chunk is None:
+            return {
+                **summary,
+                "chunks": [
+                    {"index": c["index"], "heading": c["heading"],
+                     "headings": c["headings"], "chars": len(c["content"])}
+                    for c in chunks
+                ],
+            }
+        if not 0 <= chunk < len(chunks):
             raise ValueError(
-                "Confluence token not configured. Please set ATLASSIAN_CONFLUENCE_TOKEN.")
+                f"Page {page_id} has {len(chunks)} chunks; "
+                f"chunk {chunk} does not exist")
+        return {**summary, "chunk_count": len(chunks), **chunks[chunk]}
+
+    async def _page_chunks(self, page: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return the cached chunks of a page whose body is Markdown."""
+        markdown = ((page.get("body") or {}).get("markdown") or {}).get("value") or ""
+        max_chars = self.config.confluence_chunk_chars
+        return await self.conversions.get_or_compute_async(
+            f"confluence:{page.get('id')}:chunks:{max_chars}",
+            self._confluence_version(page),
+            lambda: self.offload.run(len(markdown), chunk_markdown, markdown, max_chars),
+            size_of=lambda chunks: sum(len(c["content"]) for c in chunks),
+        )
+
+    async def confluence_search_pages(self, query: str, limit: int = 10,
+                                      space: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search for Confluence pages."""
+        return [page async for page in self.iter_confluence_pages(query, limit, space=space)]
+
+    async def iter_confluence_pages(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        page_size: int = CONFLUENCE_MAX_PAGE_SIZE,
+        space: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over the Confluence pages matching a text query.
+
+        When the local search index has fully crawled the space searched (or
+        every space), results come from the index ranked by BM25; otherwise
+        the CQL search API is used.
+        """
+        index = self.search_index
+        if index is not None and match_expression(query) and index.covers(space):
+            index.hits += 1
+            for page in index.search(query, space, limit):
+                yield page
+            return
+        if index is not None:
+            index.misses += 1
 
         url = f"{self.base_url}/wiki/rest/api/content/search"
+        cql = f"text ~ \"{query}\" and type = page"
+        if space:
+            cql += f" and space = \"{space}\""
         params = {
-            "cql": f"text ~ \"{query}\" and type = page",
-            "limit": limit,
+            "cql": cql,
             "expand": "space,version"
         }
+        async for page in self._iter_confluence(
+                "confluence_search", url, params, limit, page_size):
+            yield page
 
-        response = await self.confluence_client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("results", [])
+    async def iter_confluence_space_pages(
+        self,
+        space: str,
+        expand: str = "body.storage,space,version",
+        page_size: int = 50,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over every page in a space, by default with its storage body."""
+        url = f"{self.base_url}/wiki/rest/api/content"
+        params = {
+            "spaceKey": space,
+            "type": "page",
+            "expand": expand,
+        }
+        async for page in self._iter_confluence(
+                "confluence_space_pages", url, params, None, page_size):
+            yield page
 
-    async def confluence_list_spaces(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """List Confluence spaces."""
+    async def iter_confluence_changes(
+        self,
+        space: str,
+        since: str,
+        page_size: int = CONFLUENCE_MAX_PAGE_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over the pages in a space modified at or after a CQL date."""
+        url = f"{self.base_url}/wiki/rest/api/content/search"
+        params = {
+            "cql": f"space = \"{space}\" and type = page and lastModified >= \"{since}\"",
+            "expand": "version",
+        }
+        async for page in self._iter_confluence(
+                "confluence_changes", url, params, None, page_size):
+            yield page
+
+    async def confluence_fetch_page(self, page_id: str) -> Dict[str, Any]:
+        """Get a Confluence page with its storage body, bypassing the response cache."""
         if not self.confluence_client:
             raise ValueError(
                 "Confluence token not configured. Please set ATLASSIAN_CONFLUENCE_TOKEN.")
 
+        url = f"{self.base_url}/wiki/rest/api/content/{page_id}"
+        params = {
+            "expand": "body.storage,space,version"
+        }
+        response = await self._fetch(self.confluence_client, url, params)
+        return await self.offload.json(response.content)
+
+    async def confluence_list_spaces(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """List Confluence spaces."""
+        return [space async for space in self.iter_confluence_spaces(limit)]
+
+    async def iter_confluence_spaces(
+        self,
+        limit: Optional[int] = None,
+        page_size: int = CONFLUENCE_MAX_PAGE_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all Confluence spaces."""
         url = f"{self.base_url}/wiki/rest/api/space"
         params = {
-            "limit": limit,
             "expand": "description,homepage"
         }
+        async for space in self._iter_confluence(
+                "confluence_spaces", url, params, limit, page_size):
+            yield space
 
-        response = await self.confluence_client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("results", [])
+    async def _iter_confluence(
+        self,
+        endpoint: str,
+        url: str,
+        params: Dict[str, Any],
+        limit: Optional[int],
+        page_size: int,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over a paginated Confluence collection.
+
+        Follows _links.next (falling back to start/size) until the collection
+        is exhausted or limit results have been yielded. Only the first page
+        goes through the endpoint's cache; later pages use the uncached
+        <endpoint>_page endpoint unless it is given a TTL.
+        """
+        if not self.confluence_client:
+            raise ValueError(
+                "Confluence token not configured. Please set ATLASSIAN_CONFLUENCE_TOKEN.")
+
+        page_size = min(page_size, CONFLUENCE_MAX_PAGE_SIZE)
+        if limit is not None:
+            page_size = min(page_size, limit)
+        if page_size <= 0:
+            return
+
+        def fetch_page(next_url: Optional[str]) -> Awaitable[Any]:
+            if next_url is None:
+                return self._get(endpoint, self.confluence_client, url,
+                                 {**params, "limit": page_size})
+            return self._get(f"{endpoint}_page", self.confluence_client, next_url)
+
+        async for result in self._iter_pages(
+                fetch_page, self._confluence_next_url, "results", limit):
+            yield result
+
+    def _confluence_next_url(self, data: Dict[str, Any],
+                             received: int) -> Optional[str]:
+        """Return the absolute URL of the page after a Confluence response."""
+        links = data.get("_links") or {}
+        next_link = links.get("next")
+        if next_link:
+            if next_link.startswith("http"):
+                return next_link
+            base = links.get("base") or f"{self.base_url}/wiki"
+            return f"{base}{next_link}"
+
+        # Older responses omit _links.next but report the collection size
+        total = data.get("totalSize")
+        start = data.get("start", 0) + received
+        if total is None or start >= total or not links.get("self"):
+            return None
+        parsed = urlparse(links["self"])
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        query.update({"start": start, "limit": data.get("limit", received)})
+        return f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{urlencode(query)}"
+
+    async def confluence_get_pages(self, page_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get several Confluence pages by ID.
+
+        Returns one {"page_id", "page"} or {"page_id", "error"} entry per
+        requested ID, in order.
+        """
+        outcomes = await self._gather_bounded(page_ids, self.confluence_get_page)
+        return [
+            {"page_id": page_id, "page": outcome["result"]}
+            if "result" in outcome else {"page_id": page_id, "error": outcome["error"]}
+            for page_id, outcome in zip(page_ids, outcomes)
+        ]
 
-    async def confluence_get_page_by_url(self, page_url: str) -> Dict[str, Any]:
+    async def confluence_get_page_by_url(
+        self,
+        page_url: str,
+        body_format: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Get a Confluence page by URL."""
         page_id = self.parse_confluence_url(page_url)
         if not page_id:
             raise ValueError(f"Could not extract page ID from URL: {page_url}")
-        return await self.confluence_get_page(page_id)
+        return await self.confluence_get_page(page_id, body_format)
 
     # Jira methods
-    async def jira_get_issue(self, issue_key: str) -> Dict[str, Any]:
-        """Get a Jira issue by key."""
+    def _jira_projection(
+        self,
+        operation: str,
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
+        profile: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Build the fields/expand query parameters for a Jira issue read.
+
+        Explicit fields and expand values take precedence over the profile;
+        the profile defaults to the configured server-wide profile.
+        """
+        profile = profile or self.config.jira_profile
+        if profile not in JIRA_PROFILES:
+            raise ValueError(
+                f"Unknown Jira profile: {profile}. "
+                f"Expected one of: {', '.join(JIRA_PROFILES)}")
+        defaults = JIRA_PROFILES[profile][operation]
+
+        if fields is None:
+            fields = defaults["fields"]
+        if expand is None:
+            expand = defaults["expand"]
+
+        params = {}
+        if fields:
+            # Keep 'updated' so cached issues can be revalidated
+            if operation == "issue" and not any(
+                    f in ("updated", "*all", "*navigable") for f in fields):
+                fields = list(fields) + ["updated"]
+            params["fields"] = ",".join(fields)
+        if expand:
+            params["expand"] = ",".join(expand)
+        return params
+
+    async def jira_get_issue(
+        self,
+        issue_key: str,
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
+        profile: Optional[str] = None,
+        body_format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get a Jira issue by key.
+
+        body_format selects how rich-text fields (description, comments,
+        environment, text custom fields) are returned: "adf" (the raw
+        Atlassian Document Format JSON), "markdown" or "text". Issues of
+        mirrored projects are read from the Jira mirror while it is fresh.
+        """
+        body_format = self._jira_body_format(body_format)
         if not self.jira_client:
             raise ValueError(
                 "Jira token not configured. Please set ATLASSIAN_JIRA_TOKEN.")
 
         url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
-        params = {
-            "expand": "changelog,attachments,comments"
-        }
+        params = self._jira_projection("issue", fields, expand, profile)
 
-        response = await self.jira_client.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        if self.jira_mirror is not None:
+            issue = await self.jira_mirror.get(issue_key, params)
+            if issue is not None:
+                return await self._render_issue(issue, body_format)
 
-    async def jira_search_issues(self, jql: str, limit: int = 10) -> List[Dict[str, Any]]:
+        issue = await self._get(
+            "jira_issue", self.jira_client, url, params,
+            version_of=self._jira_version,
+            current_version=lambda: self._jira_current_version(issue_key),
+        )
+        return await self._render_issue(issue, body_format)
+
+    def _jira_body_format(self, body_format: Optional[str]) -> str:
+        """Resolve and validate a Jira document format."""
+        body_format = body_format or self.config.jira_body_format
+        if body_format not in DOCUMENT_FORMATS:
+            raise ValueError(
+                f"Unknown body format: {body_format}. "
+                f"Expected one of: {', '.join(DOCUMENT_FORMATS)}")
+        return body_format
+
+    async def _render_issue(self, issue: Dict[str, Any],
+                            body_format: str) -> Dict[str, Any]:
+        """
+        Return a copy of issue with its ADF documents rendered.
+
+        Rendered documents are cached per issue, field path and format, and
+        reused while the issue's updated timestamp is unchanged. Documents
+        missing from the cache are rendered together, in the offload
+        executor when they are large.
+        """
+        if body_format == "adf":
+            return issue
+        key = issue.get("key") or issue.get("id")
+        version = self._jira_version(issue)
+        texts: Dict[str, str] = {}
+        missing: Dict[str, Dict[str, Any]] = {}
+
+        def collect(path: str, document: Dict[str, Any]) -> Any:
+            entry = self.conversions.lookup(f"jira:{key}:{path}:{body_format}", version)
+            if entry is not None:
+                texts[path] = entry.value
+            else:
+                missing[path] = document
+            return document
+
+        render_documents(issue, collect)
+        if missing:
+            rendered = await self.offload.run(
+                self.offload.measure(missing), _render_all, missing, body_format)
+            for path, text in rendered.items():
+                self.conversions.put(f"jira:{key}:{path}:{body_format}", version, text)
+            texts.update(rendered)
+        return render_documents(issue, lambda path, document: texts[path])
+
+    async def jira_get_issues(
+        self,
+        issue_keys: List[str],
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
+        profile: Optional[str] = None,
+        body_format: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get several Jira issues by key.
+
+        Keys are resolved with JQL "key in (...)" searches of up to
+        JIRA_MAX_PAGE_SIZE keys each. Keys the searches do not return (moved
+        or deleted issues, or keys from a chunk whose search failed) are
+        fetched individually so each one gets its own result or error. Keys
+        that are not of the form PROJECT-123 get an error without a request.
+        Returns one {"issue_key", "issue"} or {"issue_key", "error"} entry
+        per requested key, in order.
+        """
+        body_format = self._jira_body_format(body_format)
+        if not self.jira_client:
+            raise ValueError(
+                "Jira token not configured. Please set ATLASSIAN_JIRA_TOKEN.")
+
+        url = f"{self.base_url}/rest/api/3/search"
+        projection = self._jira_projection("issue", fields, expand, profile)
+        errors: Dict[str, str] = {}
+        unique_keys = []
+        for key in dict.fromkeys(key.upper() for key in issue_keys):
+            if JIRA_ISSUE_KEY.match(key):
+                unique_keys.append(key)
+            else:
+                errors[key] = "Invalid issue key; expected the form PROJECT-123"
+        chunks = [unique_keys[i:i + JIRA_MAX_PAGE_SIZE]
+                  for i in range(0, len(unique_keys), JIRA_MAX_PAGE_SIZE)]
+
+        async def search_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+            params = {
+                "jql": f"key in ({', '.join(chunk)})",
+                "maxResults": len(chunk),
+                # Report unknown keys as warnings instead of failing the query
+                "validateQuery": "warn",
+                **projection,
+            }
+            data = await self._get("jira_batch", self.jira_client, url, params)
+            return data.get("issues", [])
+
+        found: Dict[str, Any] = {}
+        for outcome in await self._gather_bounded(chunks, search_chunk):
+            for issue in outcome.get("result", []):
+                found[issue["key"].upper()] = issue
+
+        missing = [key for key in unique_keys if key not in found]
+        outcomes = await self._gather_bounded(
+            missing,
+            lambda key: self.jira_get_issue(key, fields, expand, profile, "adf"))
+        for key, outcome in zip(missing, outcomes):
+            if "result" in outcome:
+                found[key] = outcome["result"]
+            else:
+                errors[key] = outcome["error"]
+
+        found = {key: await self._render_issue(issue, body_format)
+                 for key, issue in found.items()}
+
+        return [
+            {"issue_key": key, "issue": found[key.upper()]}
+            if key.upper() in found
+            else {"issue_key": key, "error": errors[key.upper()]}
+            for key in issue_keys
+        ]
+
+    async def jira_search_issues(
+        self,
+        jql: str,
+        limit: int = 10,
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
+        profile: Optional[str] = None,
+        body_format: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """Search for Jira issues using JQL."""
+        return [
+            issue async for issue in self.iter_jira_issues(
+                jql, limit, fields=fields, expand=expand, profile=profile,
+                body_format=body_format)
+        ]
+
+    async def iter_jira_issues(
+        self,
+        jql: str,
+        limit: Optional[int] = None,
+        page_size: int = JIRA_MAX_PAGE_SIZE,
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
+        profile: Optional[str] = None,
+        body_format: Optional[str] = None,
+        mirror: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over the Jira issues matching a JQL query, page by page.
+
+        Follows nextPageToken or startAt pagination until the results are
+        exhausted or limit issues have been yielded. The next page is fetched
+        while the current one is being consumed. Only the first page goes
+        through the jira_search cache; later pages use the jira_search_page
+        endpoint, which is uncached unless given a TTL.
+
+        Simple queries restricted to fresh mirrored projects are answered
+        from the Jira mirror instead; mirror=False always searches remotely.
+        """
+        body_format = self._jira_body_format(body_format)
         if not self.jira_client:
             raise ValueError(
                 "Jira token not configured. Please set ATLASSIAN_JIRA_TOKEN.")
 
         url = f"{self.base_url}/rest/api/3/search"
-        params = {
-            "jql": jql,
-            "maxResults": limit,
-            "expand": "changelog"
-        }
+        projection = self._jira_projection("search", fields, expand, profile)
+        page_size = min(page_size, JIRA_MAX_PAGE_SIZE)
+        if limit is not None:
+            page_size = min(page_size, limit)
+        if page_size <= 0:
+            return
 
-        response = await self.jira_client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("issues", [])
+        if mirror and self.jira_mirror is not None:
+            issues = await self.jira_mirror.search(jql, projection, limit)
+            if issues is not None:
+                for issue in issues:
+                    yield await self._render_issue(issue, body_format)
+                return
+
+        def fetch_page(cursor: Optional[Dict[str, Any]]) -> Awaitable[Any]:
+            params = {"jql": jql, "maxResults": page_size,
+                      **(cursor or {}), **projection}
+            endpoint = "jira_search_page" if cursor else "jira_search"
+            return self._get(endpoint, self.jira_client, url, params)
+
+        async for issue in self._iter_pages(
+            fetch_page,
+            lambda data, received: self._jira_next_cursor(
+                data, received, page_size),
+            "issues",
+            limit,
+        ):
+            yield await self._render_issue(issue, body_format)
+
+    @staticmethod
+    def _jira_next_cursor(data: Dict[str, Any], received: int,
+                          page_size: int) -> Optional[Dict[str, Any]]:
+        """Return the query parameters for the page after a search response."""
+        token = data.get("nextPageToken")
+        if token:
+            return {"nextPageToken": token}
+        if data.get("isLast"):
+            return None
+
+        start_at = data.get("startAt", 0) + received
+        total = data.get("total")
+        if total is not None:
+            if start_at >= total:
+                return None
+        elif received < page_size:
+            return None
+        return {"startAt": start_at}
 
     async def jira_list_projects(self) -> List[Dict[str, Any]]:
         """List Jira projects."""
@@ -261,14 +1343,20 @@ class AtlassianClient:
             "expand": "description,lead,projectKeys"
         }
 
-        response = await self.jira_client.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return await self._get("jira_projects", self.jira_client, url, params)
 
-    async def jira_get_issue_by_url(self, issue_url: str) -> Dict[str, Any]:
+    async def jira_get_issue_by_url(
+        self,
+        issue_url: str,
+        fields: Optional[List[str]] = None,
+        expand: Optional[List[str]] = None,
+        profile: Optional[str] = None,
+        body_format: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Get a Jira issue by URL."""
         issue_key = self.parse_jira_url(issue_url)
         if not issue_key:
             raise ValueError(
                 f"Could not extract issue key from URL: {issue_url}")
-        return await self.jira_get_issue(issue_key)
+        return await self.jira_get_issue(
+            issue_key, fields, expand, profile, body_format)
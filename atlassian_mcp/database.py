@@ -0,0 +1,25 @@
+"""SQLite setup shared by the response cache, search index and Jira mirror."""
+
+import os
+import sqlite3
+from typing import Any, Tuple
+
+
+def default_path(filename: str) -> str:
+    """Return the default location of a database under ~/.cache/atlassian-mcp."""
+    return os.path.join(os.path.expanduser("~"), ".cache", "atlassian-mcp", filename)
+
+
+def open_database(path: str, schema: str, **options: Any) -> Tuple[str, sqlite3.Connection]:
+    """Open a database in autocommit and WAL mode and create its schema.
+
+    Creates the parent directory of a file path first. Returns the expanded
+    path and the connection; options are passed on to sqlite3.connect.
+    """
+    if path != ":memory:":
+        path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    db = sqlite3.connect(path, isolation_level=None, **options)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(schema)
+    return path, db
@@ -0,0 +1,208 @@
+"""Local full-text index of Confluence pages backed by SQLite FTS5."""
+
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .database import default_path, open_database
+
+# Default location of the index database
+DEFAULT_INDEX_PATH = default_path("search.db")
+
+# Space key that stands for "every space" in the index configuration
+ALL_SPACES = "*"
+
+# Relative BM25 weights of the title and body columns
+_TITLE_WEIGHT = 10.0
+_BODY_WEIGHT = 1.0
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    space TEXT NOT NULL,
+    title TEXT NOT NULL,
+    version INTEGER,
+    updated TEXT,
+    webui TEXT
+);
+CREATE INDEX IF NOT EXISTS pages_space ON pages (space);
+CREATE VIRTUAL TABLE IF NOT EXISTS page_text USING fts5 (
+    title, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS spaces (
+    key TEXT PRIMARY KEY,
+    complete INTEGER NOT NULL DEFAULT 0,
+    indexed_at REAL,
+    checkpoint REAL
+);
+"""
+
+
+def fts5_available() -> bool:
+    """Return True if the linked SQLite library was built with FTS5."""
+    try:
+        sqlite3.connect(":memory:").execute(
+            "CREATE VIRTUAL TABLE probe USING fts5 (body)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def match_expression(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word, or None."""
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+class PageIndex:
+    """Inverted index of page titles and plain-text bodies.
+
+    Pages are stored per space; a space counts as covered once it has been
+    crawled completely, and only covered spaces are answered locally.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path, self.db = open_database(path, _SCHEMA)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(spaces)")}
+        if "checkpoint" not in columns:
+            self.db.execute("ALTER TABLE spaces ADD COLUMN checkpoint REAL")
+
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """Close the database."""
+        self.db.close()
+
+    def upsert(self, page: Dict[str, Any], text: str) -> None:
+        """Add or replace a page; text is its plain-text body."""
+        space = (page.get("space") or {}).get("key") or ""
+        version = (page.get("version") or {})
+        links = page.get("_links") or {}
+        with self.db:
+            self.db.execute("BEGIN")
+            row = self.db.execute(
+                "SELECT rowid FROM pages WHERE id = ?", (page["id"],)).fetchone()
+            if row is not None:
+                self.db.execute("DELETE FROM page_text WHERE rowid = ?", row)
+                self.db.execute("DELETE FROM pages WHERE rowid = ?", row)
+            cursor = self.db.execute(
+                "INSERT INTO pages (id, space, title, version, updated, webui) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (page["id"], space, page.get("title") or "", version.get("number"),
+                 version.get("when"), links.get("webui")))
+            self.db.execute(
+                "INSERT INTO page_text (rowid, title, body) VALUES (?, ?, ?)",
+                (cursor.lastrowid, page.get("title") or "", text))
+
+    def delete(self, page_id: str) -> None:
+        """Remove a page if it is indexed."""
+        with self.db:
+            self.db.execute("BEGIN")
+            row = self.db.execute(
+                "SELECT rowid FROM pages WHERE id = ?", (page_id,)).fetchone()
+            if row is not None:
+                self.db.execute("DELETE FROM page_text WHERE rowid = ?", row)
+                self.db.execute("DELETE FROM pages WHERE rowid = ?", row)
+
+    def versions(self, space: str) -> Dict[str, Optional[int]]:
+        """Return the indexed version of every page in a space."""
+        return dict(self.db.execute(
+            "SELECT id, version FROM pages WHERE space = ?", (space,)))
+
+    def mark_complete(self, space: str) -> None:
+        """Record that a space (or ALL_SPACES) has been fully crawled."""
+        self.db.execute(
+            "INSERT INTO spaces (key, complete, indexed_at) VALUES (?, 1, ?) "
+            "ON CONFLICT (key) DO UPDATE SET complete = 1, indexed_at = excluded.indexed_at",
+            (space, time.time()))
+
+    def checkpoint(self, space: str) -> Optional[float]:
+        """Return the time (epoch seconds) a space was last synced up to."""
+        row = self.db.execute(
+            "SELECT checkpoint FROM spaces WHERE key = ?", (space,)).fetchone()
+        return row[0] if row else None
+
+    def set_checkpoint(self, space: str, checkpoint: float) -> None:
+        """Persist the time a space has been synced up to."""
+        self.db.execute(
+            "INSERT INTO spaces (key, checkpoint) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET checkpoint = excluded.checkpoint",
+            (space, checkpoint))
+
+    def covered_spaces(self) -> List[str]:
+        """Return the keys of the fully crawled spaces."""
+        return [key for key, in self.db.execute(
+            "SELECT key FROM spaces WHERE complete = 1 ORDER BY key")]
+
+    def covers(self, space: Optional[str]) -> bool:
+        """Return True if a search in space (or in every space) can be answered locally."""
+        covered = set(self.covered_spaces())
+        if ALL_SPACES in covered:
+            return True
+        return space is not None and space in covered
+
+    def search(self, query: str, space: Optional[str] = None,
+               limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """
+        Return the best-matching pages, ranked by BM25.
+
+        Results are shaped like Confluence search results (id, type, title,
+        space, version, _links) with the matched text as an excerpt.
+        """
+        expression = match_expression(query)
+        if expression is None or (limit is not None and limit <= 0):
+            return []
+        sql = (
+            "SELECT pages.id, pages.title, pages.space, pages.version, pages.updated, "
+            "pages.webui, snippet(page_text, 1, '', '', '...', 24), "
+            f"bm25(page_text, {_TITLE_WEIGHT}, {_BODY_WEIGHT}) AS score "
+            "FROM page_text JOIN pages ON pages.rowid = page_text.rowid "
+            "WHERE page_text MATCH ?"
+        )
+        params: List[Any] = [expression]
+        if space is not None:
+            sql += " AND pages.space = ?"
+            params.append(space)
+        sql += " ORDER BY score LIMIT ?"
+        # A negative LIMIT returns every match
+        params.append(-1 if limit is None else limit)
+
+        return [
+            {
+                "id": page_id,
+                "type": "page",
+                "title": title,
+                "space": {"key": space_key},
+                "version": {"number": version, "when": updated},
+                "_links": {"webui": webui} if webui else {},
+                "excerpt": excerpt.strip(),
+                # FTS5 reports BM25 as a negative number; larger is better here
+                "score": round(-score, 4),
+            }
+            for page_id, title, space_key, version, updated, webui, excerpt, score
+            in self.db.execute(sql, params)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return index size, coverage and local/remote search counts."""
+        pages, = self.db.execute("SELECT count(*) FROM pages").fetchone()
+        return {
+            "path": self.path,
+            "pages": pages,
+            "covered_spaces": self.covered_spaces(),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def index_spaces(configured: Optional[Iterable[str]]) -> List[str]:
+    """Normalize the configured space keys; ALL_SPACES means every space."""
+    spaces = [space.strip() for space in configured or [] if space.strip()]
+    return [ALL_SPACES] if ALL_SPACES in spaces else spaces
@@ -0,0 +1,59 @@
+"""Markdown and plain-text block formatting shared by the body converters."""
+
+import re
+
+WHITESPACE = re.compile(r"\s+")
+
+
+class MarkdownEmitter:
+    """Formats blocks, list items, code, quotes and table cells.
+
+    Mixed into the storage-format converter and the ADF renderer so both
+    produce the same Markdown (or plain text when markdown is False) for
+    the same structures, with one set of escaping and fence rules.
+    """
+
+    markdown = True
+
+    def _block(self, text: str) -> str:
+        text = text.strip()
+        return f"\n\n{text}\n\n" if text else ""
+
+    def _heading(self, level: int, content: str) -> str:
+        heading = WHITESPACE.sub(" ", content).strip()
+        if self.markdown:
+            heading = "#" * level + " " + heading
+        return self._block(heading)
+
+    def _cell(self, content: str) -> str:
+        cell = WHITESPACE.sub(" ", content).strip()
+        return cell.replace("|", "\\|") if self.markdown else cell
+
+    def _item(self, marker: str, content: str) -> str:
+        """Format a list item, indenting continuation lines under the marker."""
+        text = re.sub(r"\n\s*\n", "\n", content.strip())
+        lines = text.split("\n")
+        indent = " " * len(marker)
+        return marker + lines[0] + "".join(
+            f"\n{indent}{line}" if line else "\n" for line in lines[1:])
+
+    def _code_block(self, code: str, language: str) -> str:
+        code = code.strip("\n")
+        if not self.markdown:
+            return f"\n\n{code}\n\n" if code else ""
+        return f"\n\n```{language}\n{code}\n```\n\n"
+
+    def _quote(self, content: str) -> str:
+        text = re.sub(r"\n{3,}", "\n\n", content.strip())
+        if not text:
+            return ""
+        if not self.markdown:
+            return self._block(text)
+        return self._block("\n".join(f"> {line}" if line else ">" for line in text.split("\n")))
+
+    @staticmethod
+    def _finish(text: str) -> str:
+        """Normalize the assembled document: no trailing spaces or extra blank lines."""
+        text = re.sub(r"[ \t]+\n", "\n", text)
+        text = re.sub(r"\n{3,}", "\n\n", text)
+        return text.strip() + "\n" if text.strip() else ""
@@ -0,0 +1,600 @@
+"""Local mirror of Jira issues for selected projects, kept current with JQL deltas."""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .database import default_path, open_database
+from .sync import cql_datetime
+
+if TYPE_CHECKING:
+    from .client import AtlassianClient
+
+logger = logging.getLogger(__name__)
+
+# Default location of the mirror database
+DEFAULT_MIRROR_PATH = default_path("jira.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    updated TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_project ON issues (project);
+CREATE TABLE IF NOT EXISTS projects (
+    key TEXT PRIMARY KEY,
+    checkpoint REAL,
+    synced_at REAL
+);
+"""
+
+# Issues fetched in full per "key in (...)" query when polling
+_FETCH_BATCH = 100
+
+_JQL_TOKEN = re.compile(
+    r'\s*(?:"((?:[^"\\]|\\.)*)"|\'((?:[^\'\\]|\\.)*)\'|(!=|=|\(|\)|,)|([^\s"\'=!(),]+))')
+
+
+def _name(value: Any) -> Optional[str]:
+    return value.get("name") if isinstance(value, dict) else None
+
+
+def _user(value: Any) -> List[str]:
+    if not isinstance(value, dict):
+        return []
+    return [value[k] for k in ("accountId", "displayName", "emailAddress", "name")
+            if value.get(k)]
+
+
+def _named(field: str) -> Callable[[Dict[str, Any]], List[str]]:
+    def values(issue: Dict[str, Any]) -> List[str]:
+        name = _name((issue.get("fields") or {}).get(field))
+        return [name] if name else []
+    return values
+
+
+# Field accessors for the JQL subset; each returns the candidate values
+_JQL_FIELDS: Dict[str, Callable[[Dict[str, Any]], List[str]]] = {
+    "project": lambda issue: [
+        v for v in (((issue.get("fields") or {}).get("project") or {}).get(k)
+                    for k in ("key", "id", "name")) if v],
+    "key": lambda issue: [issue.get("key") or ""],
+    "status": _named("status"),
+    "issuetype": _named("issuetype"),
+    "priority": _named("priority"),
+    "resolution": _named("resolution"),
+    "assignee": lambda issue: _user((issue.get("fields") or {}).get("assignee")),
+    "reporter": lambda issue: _user((issue.get("fields") or {}).get("reporter")),
+    "labels": lambda issue: list((issue.get("fields") or {}).get("labels") or []),
+}
+_JQL_ALIASES = {"issuekey": "key", "type": "issuetype"}
+
+# Sort keys for ORDER BY; issue keys sort by project, then number
+_JQL_ORDER: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "updated": lambda issue: (issue.get("fields") or {}).get("updated") or "",
+    "created": lambda issue: (issue.get("fields") or {}).get("created") or "",
+    "key": lambda issue: _key_order(issue.get("key") or ""),
+}
+
+
+def _key_order(key: str) -> Tuple[str, int]:
+    project, _, number = key.partition("-")
+    return project, int(number) if number.isdigit() else 0
+
+
+class SimpleJQL:
+    """A parsed JQL query from the subset the mirror can evaluate.
+
+    Supports AND-ed clauses of the form "field = value", "field != value",
+    "field [NOT] IN (a, b)" and "field IS [NOT] EMPTY" on project, key,
+    status, issuetype, priority, resolution, assignee, reporter and labels,
+    followed by an optional ORDER BY on updated, created or key. Values
+    compare case-insensitively. parse() returns None for anything else,
+    including OR, functions and text searches.
+    """
+
+    def __init__(self, clauses: List[Tuple[str, str, List[Optional[str]]]],
+                 order: List[Tuple[str, bool]]):
+        self.clauses = clauses
+        self.order = order
+
+    @classmethod
+    def parse(cls, jql: str) -> Optional["SimpleJQL"]:
+        """Parse a JQL query, or return None if it is outside the subset."""
+        tokens: List[Tuple[str, str]] = []
+        position = 0
+        text = jql.strip()
+        while position < len(text):
+            match = _JQL_TOKEN.match(text, position)
+            if not match or match.end() == position:
+                return None
+            position = match.end()
+            double, single, symbol, word = match.groups()
+            if double is not None or single is not None:
+                tokens.append(("value", double if double is not None else single))
+            elif symbol is not None:
+                tokens.append(("symbol", symbol))
+            elif word is not None:
+                tokens.append(("word", word))
+
+        clauses: List[Tuple[str, str, List[Optional[str]]]] = []
+        order: List[Tuple[str, bool]] = []
+        i = 0
+
+        def word(index: int) -> str:
+            if index < len(tokens) and tokens[index][0] == "word":
+                return tokens[index][1].lower()
+            return ""
+
+        def value(index: int) -> Optional[str]:
+            if index < len(tokens) and tokens[index][0] in ("value", "word"):
+                return tokens[index][1]
+            return None
+
+        def literal(index: int) -> Optional[str]:
+            # Unquoted EMPTY and NULL stand for an empty field, as in "IS EMPTY"
+            return None if word(index) in ("empty", "null") else value(index)
+
+        while i < len(tokens):
+            if word(i) == "order" and word(i + 1) == "by":
+                i += 2
+                while i < len(tokens):
+                    field = _JQL_ALIASES.get(word(i), word(i))
+                    if field not in _JQL_ORDER:
+                        return None
+                    descending = False
+                    i += 1
+                    if word(i) in ("asc", "desc"):
+                        descending = word(i) == "desc"
+                        i += 1
+                    order.append((field, descending))
+                    if i < len(tokens) and tokens[i] == ("symbol", ","):
+                        i += 1
+                        continue
+                    break
+                if i != len(tokens) or not order:
+                    return None
+                break
+
+            if clauses:
+                if word(i) != "and":
+                    return None
+                i += 1
+            if i >= len(tokens) or tokens[i][0] != "word":
+                return None
+            field = _JQL_ALIASES.get(word(i), word(i))
+            if field not in _JQL_FIELDS:
+                return None
+            i += 1
+
+            if word(i) == "is":
+                negate = word(i + 1) == "not"
+                i += 2 if negate else 1
+                if word(i) not in ("empty", "null"):
+                    return None
+                clauses.append((field, "not in" if negate else "in", [None]))
+                i += 1
+            elif word(i) in ("in", "not"):
+                operator = "in"
+                if word(i) == "not":
+                    if word(i + 1) != "in":
+                        return None
+                    operator = "not in"
+                    i += 1
+                i += 1
+                if i >= len(tokens) or tokens[i] != ("symbol", "("):
+                    return None
+                i += 1
+                values: List[Optional[str]] = []
+                while True:
+                    item = value(i)
+                    if item is None or (i + 1 < len(tokens) and tokens[i + 1] == ("symbol", "(")):
+                        return None
+                    values.append(literal(i))
+                    i += 1
+                    if i < len(tokens) and tokens[i] == ("symbol", ","):
+                        i += 1
+                        continue
+                    if i < len(tokens) and tokens[i] == ("symbol", ")"):
+                        i += 1
+                        break
+                    return None
+                clauses.append((field, operator, values))
+            elif i < len(tokens) and tokens[i] in (("symbol", "="), ("symbol", "!=")):
+                operator = "in" if tokens[i][1] == "=" else "not in"
+                item = value(i + 1)
+                # A following "(" means a function call such as currentUser()
+                if item is None or (i + 2 < len(tokens) and tokens[i + 2] == ("symbol", "(")):
+                    return None
+                clauses.append((field, operator, [literal(i + 1)]))
+                i += 2
+            else:
+                return None
+        return cls(clauses, order) if clauses else None
+
+    def projects(self) -> Optional[List[str]]:
+        """Return the projects the query is restricted to, or None if unrestricted."""
+        for field, operator, values in self.clauses:
+            if operator != "in" or None in values:
+                continue
+            if field == "project":
+                return [v.upper() for v in values if v is not None]
+            if field == "key":
+                return sorted({v.upper().partition("-")[0] for v in values if v is not None})
+        return None
+
+    def matches(self, issue: Dict[str, Any]) -> bool:
+        """Return True if an issue satisfies every clause."""
+        for field, operator, values in self.clauses:
+            actual = {v.casefold() for v in _JQL_FIELDS[field](issue)}
+            # As in Jira, != and NOT IN never match an empty field
+            if operator == "not in" and not actual:
+                return False
+            found = False
+            for expected in values:
+                if expected is None:
+                    found = found or not actual
+                elif field == "resolution" and expected.casefold() == "unresolved":
+                    found = found or not actual
+                else:
+                    found = found or expected.casefold() in actual
+            if found != (operator == "in"):
+                return False
+        return True
+
+    def sort(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sort issues by the ORDER BY clause, most recently updated first by default."""
+        order = self.order or [("updated", True)]
+        for field, descending in reversed(order):
+            issues.sort(key=_JQL_ORDER[field], reverse=descending)
+        return issues
+
+
+class IssueStore:
+    """SQLite-backed issue store with an in-memory copy for fast reads.
+
+    Several processes may share one database while only one of them syncs;
+    the others notice its commits through PRAGMA data_version and reload
+    the issues whose updated timestamp changed (see refresh()).
+
+    Queries and JSON encoding run on a dedicated thread, so the event loop
+    never waits on the database. The issues and checkpoints read by the
+    mirror live in memory and are only changed on the loop, once the
+    matching database work has finished.
+    """
+
+    def __init__(self, path: str = DEFAULT_MIRROR_PATH):
+        self.path, self.db = open_database(path, _SCHEMA, check_same_thread=False)
+        # One thread keeps the connection's transactions from interleaving
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="atlassian-mirror")
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self.checkpoints: Dict[str, Tuple[float, float]] = {}
+        # Only touched on the database thread
+        self._updated: Dict[str, Optional[str]] = {}
+        self._data_version: Optional[int] = None
+        self._apply(self._changes())
+
+    def close(self) -> None:
+        """Close the database."""
+        self._executor.shutdown(wait=True)
+        self.db.close()
+
+    async def _run(self, function: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, function, *args)
+
+    async def refresh(self) -> None:
+        """Pick up issues and checkpoints written or deleted by other processes."""
+        self._apply(await self._run(self._changes))
+
+    def _changes(self) -> Optional[Tuple[List[str], Dict[str, Dict[str, Any]],
+                                         Dict[str, Tuple[float, float]]]]:
+        """Read what other connections changed: (deleted, loaded, checkpoints)."""
+        version, = self.db.execute("PRAGMA data_version").fetchone()
+        if version == self._data_version:
+            return None
+        self._data_version = version
+        current = dict(self.db.execute("SELECT key, updated FROM issues"))
+        deleted = [key for key in self._updated if key not in current]
+        for key in deleted:
+            del self._updated[key]
+        changed = [key for key, updated in current.items()
+                   if key not in self._updated or self._updated[key] != updated]
+        loaded: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(changed), 500):
+            batch = changed[start:start + 500]
+            placeholders = ", ".join("?" * len(batch))
+            for key, updated, data in self.db.execute(
+                    f"SELECT key, updated, data FROM issues WHERE key IN ({placeholders})",
+                    batch):
+                loaded[key] = json.loads(data)
+                self._updated[key] = updated
+        checkpoints = {
+            project: (checkpoint, synced_at)
+            for project, checkpoint, synced_at in self.db.execute(
+                "SELECT key, checkpoint, synced_at FROM projects")
+        }
+        return deleted, loaded, checkpoints
+
+    def _apply(self, changes: Optional[Tuple[List[str], Dict[str, Dict[str, Any]],
+                                             Dict[str, Tuple[float, float]]]]) -> None:
+        if changes is None:
+            return
+        deleted, loaded, checkpoints = changes
+        for key in deleted:
+            self.issues.pop(key, None)
+        self.issues.update(loaded)
+        self.checkpoints.update(checkpoints)
+
+    async def upsert(self, issues: List[Dict[str, Any]]) -> None:
+        """Add or replace issues."""
+        keys = await self._run(self._write, issues)
+        self.issues.update(zip(keys, issues))
+
+    def _write(self, issues: List[Dict[str, Any]]) -> List[str]:
+        rows = []
+        for issue in issues:
+            key = issue["key"].upper()
+            project = key.partition("-")[0]
+            updated = (issue.get("fields") or {}).get("updated")
+            rows.append((key, project, updated, json.dumps(issue, separators=(",", ":"))))
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                "INSERT OR REPLACE INTO issues (key, project, updated, data) "
+                "VALUES (?, ?, ?, ?)", rows)
+        for key, _, updated, _ in rows:
+            self._updated[key] = updated
+        return [row[0] for row in rows]
+
+    async def delete(self, keys: List[str]) -> None:
+        """Remove issues."""
+        await self._run(self._remove, keys)
+        for key in keys:
+            self.issues.pop(key, None)
+
+    def _remove(self, keys: List[str]) -> None:
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany("DELETE FROM issues WHERE key = ?", [(k,) for k in keys])
+        for key in keys:
+            self._updated.pop(key, None)
+
+    async def updated(self, project: str) -> Dict[str, Optional[str]]:
+        """Return the stored updated timestamp of every issue in a project."""
+        return await self._run(self._project_updated, project)
+
+    def _project_updated(self, project: str) -> Dict[str, Optional[str]]:
+        return dict(self.db.execute(
+            "SELECT key, updated FROM issues WHERE project = ?", (project,)))
+
+    def checkpoint(self, project: str) -> Tuple[Optional[float], Optional[float]]:
+        """Return (checkpoint, synced_at) for a project, as of the last refresh."""
+        return self.checkpoints.get(project, (None, None))
+
+    async def set_checkpoint(self, project: str, checkpoint: float) -> None:
+        """Persist that a project has been synced up to checkpoint."""
+        await self._run(self._save_checkpoint, project, checkpoint)
+        self.checkpoints[project] = (checkpoint, checkpoint)
+
+    def _save_checkpoint(self, project: str, checkpoint: float) -> None:
+        self.db.execute(
+            "INSERT INTO projects (key, checkpoint, synced_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET checkpoint = excluded.checkpoint, "
+            "synced_at = excluded.synced_at",
+            (project, checkpoint, checkpoint))
+
+
+class JiraMirror:
+    """Keeps the issues of selected projects current and answers reads locally.
+
+    The first sync of a project lists every issue; afterwards each cycle runs
+    an 'updated >= checkpoint' JQL query for just the updated timestamps and
+    fetches the issues that changed in full, in batches. Deleted
+    issues are caught by a key listing once per process start and every
+    reconcile_interval seconds. Reads are served only while the project's
+    last successful sync is at most max_staleness seconds old, and only for
+    requests without expansions (changelog, renderedFields, ...).
+    """
+
+    def __init__(
+        self,
+        client: "AtlassianClient",
+        store: IssueStore,
+        projects: List[str],
+        interval: float = 60.0,
+        max_staleness: float = 300.0,
+        overlap: float = 86400.0,
+        reconcile_interval: float = 86400.0,
+    ):
+        self.client = client
+        self.store = store
+        self.projects = [project.strip().upper() for project in projects if project.strip()]
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self.overlap = overlap
+        self.reconcile_interval = reconcile_interval
+        self._reconciled: Dict[str, float] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.cycles = 0
+        self.errors = 0
+        self.issues_fetched = 0
+        self.issues_deleted = 0
+        self.fetch_seconds = 0.0
+
+    async def run(self) -> None:
+        """Sync forever, sleeping interval seconds between cycles."""
+        while True:
+            try:
+                await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Jira mirror sync failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def sync_once(self) -> None:
+        """Bring every mirrored project up to date once."""
+        for project in self.projects:
+            await self.sync_project(project)
+        self.cycles += 1
+
+    async def sync_project(self, project: str) -> None:
+        """List, reconcile or poll one project and advance its checkpoint."""
+        started = time.time()
+        checkpoint, _ = self.store.checkpoint(project)
+        fetch_started = time.monotonic()
+        if checkpoint is None:
+            await self._crawl(project)
+            self._reconciled[project] = started
+        else:
+            if started - self._reconciled.get(project, 0.0) >= self.reconcile_interval:
+                await self._reconcile(project)
+                self._reconciled[project] = started
+            await self._poll(project, checkpoint)
+        self.fetch_seconds += time.monotonic() - fetch_started
+        await self.store.set_checkpoint(project, started)
+
+    async def _search(self, jql: str, fields: List[str]) -> List[Dict[str, Any]]:
+        return [
+            issue async for issue in self.client.iter_jira_issues(
+                jql, fields=fields, expand=[], body_format="adf", mirror=False)
+        ]
+
+    async def _crawl(self, project: str) -> None:
+        known = await self.store.updated(project)
+        issues = await self._search(f'project = "{project}" ORDER BY updated ASC', ["*all"])
+        await self._store(
+            [i for i in issues if known.get(i["key"].upper()) != self._updated(i)])
+        await self._delete(set(known) - {issue["key"].upper() for issue in issues})
+        logger.info(f"Mirrored {len(issues)} issues in Jira project {project}")
+
+    async def _reconcile(self, project: str) -> None:
+        """Drop issues that no longer exist in the project."""
+        known = await self.store.updated(project)
+        current = await self._search(f'project = "{project}"', ["updated"])
+        await self._delete(set(known) - {issue["key"].upper() for issue in current})
+
+    async def _poll(self, project: str, checkpoint: float) -> None:
+        known = await self.store.updated(project)
+        # JQL accepts the same "yyyy-MM-dd HH:mm" dates as CQL
+        since = cql_datetime(checkpoint - self.overlap)
+        listed = await self._search(
+            f'project = "{project}" AND updated >= "{since}" ORDER BY updated ASC', ["updated"])
+        changed = [issue["key"] for issue in listed
+                   if known.get(issue["key"].upper()) != self._updated(issue)]
+        for start in range(0, len(changed), _FETCH_BATCH):
+            keys = ", ".join(changed[start:start + _FETCH_BATCH])
+            await self._store(await self._search(f"key in ({keys})", ["*all"]))
+
+    async def _store(self, issues: List[Dict[str, Any]]) -> None:
+        if issues:
+            await self.store.upsert(issues)
+            self.issues_fetched += len(issues)
+
+    async def _delete(self, keys: Any) -> None:
+        keys = list(keys)
+        if keys:
+            await self.store.delete(keys)
+            self.issues_deleted += len(keys)
+
+    @staticmethod
+    def _updated(issue: Dict[str, Any]) -> Optional[str]:
+        return (issue.get("fields") or {}).get("updated")
+
+    # Reads
+    def is_fresh(self, project: str) -> bool:
+        """Return True if a project was synced within the staleness bound.
+
+        Checkpoints written by another process are seen after refresh().
+        """
+        if project not in self.projects:
+            return False
+        _, synced_at = self.store.checkpoint(project)
+        return synced_at is not None and time.time() - synced_at <= self.max_staleness
+
+    async def get(self, issue_key: str,
+                  params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Return a mirrored issue projected to params, or None to read remotely."""
+        key = issue_key.upper()
+        project = key.partition("-")[0]
+        if "expand" in params or project not in self.projects:
+            self.misses += 1
+            return None
+        await self.store.refresh()
+        if not self.is_fresh(project):
+            self.misses += 1
+            return None
+        issue = self.store.issues.get(key)
+        if issue is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._project(issue, params)
+
+    async def search(self, jql: str, params: Dict[str, str],
+                     limit: Optional[int]) -> Optional[List[Dict[str, Any]]]:
+        """Evaluate a simple JQL query against the mirror, or return None."""
+        query = SimpleJQL.parse(jql)
+        projects = query.projects() if query else None
+        if ("expand" in params or not projects
+                or not all(project in self.projects for project in projects)):
+            self.misses += 1
+            return None
+        await self.store.refresh()
+        if not all(self.is_fresh(project) for project in projects):
+            self.misses += 1
+            return None
+        self.hits += 1
+        prefixes = tuple(f"{project}-" for project in projects)
+        issues = query.sort([
+            issue for key, issue in self.store.issues.items()
+            if key.startswith(prefixes) and query.matches(issue)
+        ])
+        if limit is not None:
+            issues = issues[:limit]
+        return [self._project(issue, params) for issue in issues]
+
+    @staticmethod
+    def _project(issue: Dict[str, Any], params: Dict[str, str]) -> Dict[str, Any]:
+        """Reduce a stored issue to the requested fields."""
+        wanted = params.get("fields")
+        if not wanted:
+            return issue
+        names = wanted.split(",")
+        if "*all" in names or "*navigable" in names:
+            return issue
+        fields = issue.get("fields") or {}
+        return {**issue, "fields": {name: fields[name] for name in names if name in fields}}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return mirror size, hit counts, throughput and per-project lag."""
+        now = time.time()
+        lag = {}
+        for project in self.projects:
+            _, synced_at = self.store.checkpoint(project)
+            lag[project] = round(now - synced_at, 1) if synced_at is not None else None
+        return {
+            "path": self.store.path,
+            "issues": len(self.store.issues),
+            "hits": self.hits,
+            "misses": self.misses,
+            "cycles": self.cycles,
+            "errors": self.errors,
+            "issues_fetched": self.issues_fetched,
+            "issues_deleted": self.issues_deleted,
+            "issues_per_second": (
+                round(self.issues_fetched / self.fetch_seconds, 2)
+                if self.fetch_seconds else 0.0),
+            "max_staleness": self.max_staleness,
+            "lag_seconds": lag,
+        }
@@ -0,0 +1,197 @@
+"""Executor offloading of CPU-heavy stages and event-loop lag measurement."""
+
+import asyncio
+import json
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Executors selectable in the configuration
+OFFLOAD_EXECUTORS = ("thread", "process", "none")
+
+# Default payload size in bytes from which a stage leaves the event loop
+DEFAULT_OFFLOAD_THRESHOLD = 256 * 1024
+
+
+def decode_json(data: bytes) -> Any:
+    """Parse a JSON document (module-level so process pools can pickle it)."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def approximate_size(value: Any, limit: Optional[int] = None) -> int:
+    """
+    Estimate the serialized size of a JSON-like value in bytes.
+
+    Counts string and key lengths plus a few bytes per scalar, walking the
+    value with an explicit stack. Stops as soon as the estimate reaches
+    limit, so checking a large value against a threshold stays cheap.
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            size += len(node) + 2
+        elif isinstance(node, dict):
+            size += 2
+            for key, item in node.items():
+                size += len(key) + 4
+                stack.append(item)
+        elif isinstance(node, list):
+            size += 2 + len(node)
+            stack.extend(node)
+        else:
+            size += 8
+        if limit is not None and size >= limit:
+            return size
+    return size
+
+
+class Offloader:
+    """Runs CPU-heavy stages inline or in an executor, by payload size.
+
+    Stages whose input is at least threshold bytes run in a thread pool.
+    Body conversion, ADF rendering, slimming and budgeting are Python code,
+    so the interpreter switches back to the event loop every few
+    milliseconds while they run. JSON decoding is C code that holds the GIL
+    for the whole document, so a thread would not free the loop: large
+    responses are decoded in worker processes with the "process" executor
+    and inline otherwise. "none" runs everything inline.
+    """
+
+    def __init__(self, executor: str = "thread",
+                 threshold: int = DEFAULT_OFFLOAD_THRESHOLD, workers: int = 4):
+        if executor not in OFFLOAD_EXECUTORS:
+            raise ValueError(
+                f"Unknown offload executor: {executor}. "
+                f"Expected one of: {', '.join(OFFLOAD_EXECUTORS)}")
+        self.executor = executor
+        self.threshold = threshold
+        self.workers = max(workers, 1)
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+        self.inline = 0
+        self.offloaded = 0
+        self.offload_seconds = 0.0
+        self.max_offload_seconds = 0.0
+
+    def measure(self, value: Any) -> int:
+        """Return the approximate size of value, counted up to the threshold."""
+        return approximate_size(value, self.threshold)
+
+    def _pool(self, processes: bool) -> Executor:
+        if processes:
+            if self._processes is None:
+                # Spawned workers do not inherit the server's threads and sockets
+                self._processes = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._processes
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                self.workers, thread_name_prefix="atlassian-offload")
+        return self._threads
+
+    async def run(self, size: int, function: Callable[..., Any], *args: Any) -> Any:
+        """Call function(*args), in the thread pool if size reaches the threshold."""
+        return await self._run(size, False, function, *args)
+
+    async def json(self, data: bytes) -> Any:
+        """Decode a JSON response body, in a worker process if it is large."""
+        if self.executor != "process":
+            self.inline += 1
+            return decode_json(data)
+        return await self._run(len(data), True, decode_json, data)
+
+    async def _run(self, size: int, processes: bool,
+                   function: Callable[..., Any], *args: Any) -> Any:
+        if self.executor == "none" or size < self.threshold:
+            self.inline += 1
+            return function(*args)
+
+        self.offloaded += 1
+        started = time.monotonic()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pool(processes), function, *args)
+        finally:
+            elapsed = time.monotonic() - started
+            self.offload_seconds += elapsed
+            self.max_offload_seconds = max(self.max_offload_seconds, elapsed)
+
+    def close(self) -> None:
+        """Shut down the executors without waiting for running stages."""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False)
+        self._threads = self._processes = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return inline/offloaded stage counts and time spent in the executor."""
+        return {
+            "executor": self.executor,
+            "threshold_bytes": self.threshold,
+            "workers": self.workers,
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "offload_seconds": round(self.offload_seconds, 6),
+            "max_offload_seconds": round(self.max_offload_seconds, 6),
+        }
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a short sleep.
+
+    Anything that blocks the loop (a large synchronous parse, a long
+    conversion) delays every other tool call by the same amount, and shows
+    up here as lag.
+    """
+
+    def __init__(self, interval: float = 0.1, window: int = 600,
+                 stall_threshold: float = 0.1):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._recent: Deque[float] = deque(maxlen=window)
+
+        self.samples = 0
+        self.stalls = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    async def run(self) -> None:
+        """Sample the loop lag forever."""
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.record(max(time.monotonic() - started - self.interval, 0.0))
+
+    def record(self, lag: float) -> None:
+        """Record one lag sample in seconds."""
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= self.stall_threshold:
+            self.stalls += 1
+        self._recent.append(lag)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return average, maximum and recent lag in milliseconds, and stalls."""
+        recent = sorted(self._recent)
+        return {
+            "samples": self.samples,
+            "avg_lag_ms": round(self.total_lag / self.samples * 1000, 3) if self.samples else 0.0,
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "recent_p99_lag_ms": (
+                round(recent[min(int(len(recent) * 0.99), len(recent) - 1)] * 1000, 3)
+                if recent else 0.0),
+            "recent_max_lag_ms": round(recent[-1] * 1000, 3) if recent else 0.0,
+            "stalls": self.stalls,
+            "stall_threshold_ms": self.stall_threshold * 1000,
+        }
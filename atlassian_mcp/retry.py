@@ -0,0 +1,142 @@
+"""Rate-limit aware retry policy for Atlassian API requests."""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+# Statuses worth retrying for idempotent GETs
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse an X-RateLimit-Reset header (ISO 8601 timestamp) into seconds from now."""
+    if not value:
+        return None
+    try:
+        when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryPolicy:
+    """Jittered exponential backoff with a shared rate-limit block and retry budget.
+
+    One policy is shared by the Confluence and Jira clients. A 429 or an
+    exhausted X-RateLimit-Remaining blocks new requests for both products until
+    the advertised reset time. Every request deposits budget_ratio tokens into
+    a retry budget holding at most budget_capacity tokens and every retry
+    spends one, so retries stay a bounded fraction of traffic instead of
+    amplifying an overload.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        budget_ratio: float = 0.2,
+        budget_capacity: float = 10.0,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_capacity = budget_capacity
+
+        self._budget = budget_capacity
+        self._blocked_until = 0.0
+
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.exhausted = 0
+        self.budget_exhausted = 0
+        self.backoff_seconds = 0.0
+
+    async def wait_if_blocked(self) -> None:
+        """Sleep until any shared rate-limit block has lifted."""
+        delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            self.backoff_seconds += delay
+            await asyncio.sleep(delay)
+
+    def record_request(self) -> None:
+        """Count an outgoing request and top up the retry budget."""
+        self.requests += 1
+        self._budget = min(self._budget + self.budget_ratio, self.budget_capacity)
+
+    def observe(self, response: httpx.Response) -> None:
+        """Update the shared block from a response's rate-limit headers."""
+        block = None
+        if response.status_code == 429:
+            self.rate_limited += 1
+            block = _parse_retry_after(response.headers.get("Retry-After"))
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if block is None and remaining is not None and remaining.strip() == "0":
+            block = _parse_reset(response.headers.get("X-RateLimit-Reset"))
+        if block:
+            self._blocked_until = max(self._blocked_until,
+                                      time.monotonic() + min(block, self.max_delay))
+
+    def backoff(self, attempt: int,
+                response: Optional[httpx.Response] = None) -> Optional[float]:
+        """
+        Return how long to wait before retry number attempt + 1, or None.
+
+        None means the request should not be retried, either because the
+        attempt limit or the shared retry budget is exhausted.
+        """
+        if attempt >= self.max_retries:
+            self.exhausted += 1
+            return None
+        if self._budget < 1:
+            self.budget_exhausted += 1
+            return None
+        self._budget -= 1
+        self.retries += 1
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = min(retry_after, self.max_delay) + random.uniform(0, self.base_delay)
+        self.backoff_seconds += delay
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Return retry and rate-limit counters."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "retries_exhausted": self.exhausted,
+            "budget_exhausted": self.budget_exhausted,
+            "budget_remaining": round(self._budget, 2),
+            "backoff_seconds": round(self.backoff_seconds, 3),
+            "blocked_for_seconds": round(max(self._blocked_until - time.monotonic(), 0.0), 3),
+        }
@@ -0,0 +1,188 @@
+"""Bounded-concurrency request scheduler for Atlassian API calls."""
+
+import asyncio
+import contextvars
+import time
+import weakref
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Hashable, Optional
+
+# Identifies the tool call a request belongs to. Tasks spawned by a tool call
+# (prefetches, batch fan-out) inherit it, so they queue as the same caller.
+current_caller: contextvars.ContextVar[Optional[Hashable]] = contextvars.ContextVar(
+    "current_caller", default=None)
+
+
+class ProductQueue:
+    """In-flight limit for one product with round-robin queueing across callers."""
+
+    def __init__(self, limit: int):
+        self.limit = max(limit, 1)
+        self.in_flight = 0
+        self._waiters: "OrderedDict[Hashable, Deque[asyncio.Future]]" = OrderedDict()
+
+        self.requests = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    async def acquire(self, caller: Hashable) -> None:
+        """Wait for an in-flight slot."""
+        self.requests += 1
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(caller, deque()).append(future)
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.release()
+            else:
+                self._discard(caller, future)
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def release(self) -> None:
+        """Return a slot and hand it to the next caller in round-robin order."""
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < self.limit:
+            caller, waiters = next(iter(self._waiters.items()))
+            future = waiters.popleft()
+            if waiters:
+                self._waiters.move_to_end(caller)
+            else:
+                del self._waiters[caller]
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    def _discard(self, caller: Hashable, future: asyncio.Future) -> None:
+        waiters = self._waiters.get(caller)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._waiters[caller]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "queued": self.queued,
+            "total_wait_seconds": round(self.total_wait, 6),
+            "avg_wait_seconds": round(self.total_wait / self.queued, 6) if self.queued else 0.0,
+            "max_wait_seconds": round(self.max_wait, 6),
+        }
+
+
+class RequestScheduler:
+    """Caps in-flight requests per product and queues the rest fairly.
+
+    Waiting requests are served round-robin by caller (see current_caller), so
+    one tool call fanning out many requests cannot starve the others.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.queues = {product: ProductQueue(limit)
+                       for product, limit in limits.items()}
+
+    @asynccontextmanager
+    async def slot(self, product: str) -> AsyncIterator[None]:
+        """Hold an in-flight slot for product for the duration of the block."""
+        queue = self.queues.get(product)
+        if queue is None:
+            yield
+            return
+
+        await queue.acquire(current_caller.get())
+        try:
+            yield
+        finally:
+            queue.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue-depth and wait-time metrics per product."""
+        return {product: queue.stats() for product, queue in self.queues.items()}
+
+
+class SessionLimiter:
+    """Caps the concurrent tool calls of each client session.
+
+    When one server process serves many sessions, this keeps a single
+    session from occupying every API slot. Sessions are tracked weakly and
+    forgotten once they close; a limit of zero disables the cap.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(limit, 0)
+        self._semaphores: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary())
+        self.in_flight = 0
+
+        self.calls = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self, session: Any) -> AsyncIterator[None]:
+        """Hold one of session's call slots for the duration of the block."""
+        self.calls += 1
+        if not self.limit or session is None:
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+            return
+
+        semaphore = self._semaphores.get(session)
+        if semaphore is None:
+            semaphore = self._semaphores[session] = asyncio.Semaphore(self.limit)
+        if semaphore.locked():
+            self.queued += 1
+        started = time.monotonic()
+        async with semaphore:
+            waited = time.monotonic() - started
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of sessions, calls in flight and queueing metrics."""
+        return {
+            "limit": self.limit,
+            "sessions": len(self._semaphores),
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "queued": self.queued,
+            "max_wait_seconds": round(self.max_wait, 6),
+            "avg_wait_seconds": round(self.total_wait / self.queued, 6) if self.queued else 0.0,
+        }
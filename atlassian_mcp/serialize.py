@@ -0,0 +1,84 @@
+"""JSON serializers for tool output."""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Output formats accepted by the per-call "format" argument
+FORMATS = ("compact", "pretty")
+
+
+class Serializer:
+    """Encodes tool results as compact or pretty JSON.
+
+    The "orjson" backend is used when requested (or with "auto") and the
+    optional orjson package is installed; values it cannot encode fall back
+    to the standard library encoder.
+    """
+
+    def __init__(self, default_format: str = "compact", backend: str = "auto"):
+        if default_format not in FORMATS:
+            raise ValueError(
+                f"Unknown output format: {default_format}. "
+                f"Expected one of: {', '.join(FORMATS)}")
+        if backend not in ("auto", "json", "orjson"):
+            raise ValueError(
+                f"Unknown JSON backend: {backend}. Expected auto, json or orjson")
+        if backend == "orjson" and not ORJSON_AVAILABLE:
+            logger.warning(
+                "orjson backend requested but the 'orjson' package is not "
+                "installed; falling back to json")
+        self.default_format = default_format
+        self.backend = "orjson" if backend != "json" and ORJSON_AVAILABLE else "json"
+
+        self.encoded = 0
+        self.chars_out = 0
+
+    def _format(self, format: Optional[str]) -> str:
+        format = format or self.default_format
+        if format not in FORMATS:
+            raise ValueError(
+                f"Unknown output format: {format}. "
+                f"Expected one of: {', '.join(FORMATS)}")
+        return format
+
+    def dumps(self, value: Any, format: Optional[str] = None) -> str:
+        """Serialize a value in the given (or default) format."""
+        text = self._encode(value, self._format(format) == "pretty")
+        self.encoded += 1
+        self.chars_out += len(text)
+        return text
+
+    def _encode(self, value: Any, pretty: bool) -> str:
+        if self.backend == "orjson":
+            try:
+                option = orjson.OPT_INDENT_2 if pretty else 0
+                return orjson.dumps(value, option=option).decode("utf-8")
+            except TypeError:
+                pass
+        if pretty:
+            return json.dumps(value, indent=2, ensure_ascii=False)
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+    def join(self, items: List[str], format: Optional[str] = None) -> str:
+        """Combine already-serialized items into a JSON array."""
+        separator = ",\n" if self._format(format) == "pretty" else ","
+        return "[" + separator.join(items) + "]"
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the backend and the amount of output produced."""
+        return {
+            "backend": self.backend,
+            "default_format": self.default_format,
+            "encoded": self.encoded,
+            "chars_out": self.chars_out,
+        }
@@ -1,17 +1,30 @@
 """MCP server for Atlassian products (Confluence and Jira)."""
 
 import asyncio
-import json
+import itertools
 import logging
-from typing import Any, Sequence
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
 from urllib.parse import urlparse
 
 from mcp.server import Server
 from mcp.server.models import InitializationOptions, ServerCapabilities
 from mcp.server.stdio import stdio_server
-from mcp.types import Resource, TextContent, Tool
+from mcp.types import Resource, ResourceTemplate, TextContent, Tool
 
-from .client import AtlassianClient, AtlassianConfig
+from .adf import DOCUMENT_FORMATS
+from .budget import Budget, decode_cursor, digest, encode_cursor
+from .client import JIRA_PROFILES, AtlassianClient, AtlassianConfig
+from .scheduler import SessionLimiter, current_caller
+from .serialize import FORMATS, Serializer
+from .storage import BODY_FORMATS
+from .transform import Slimmer
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -20,19 +33,293 @@ logger = logging.getLogger(__name__)
 # Global client instance
 client: AtlassianClient | None = None
 
+# Output transform and serializer, configured from the client configuration
+# on first use
+slimmer: Slimmer | None = None
+serializer: Serializer | None = None
+
+# Per-session tool call limit, configured from the client configuration and
+# applied only to sessions served over HTTP (see create_http_app)
+sessions: SessionLimiter | None = None
+limit_sessions = False
+
+# Network transports accepted by serve_http
+HTTP_TRANSPORTS = ("streamable-http", "sse")
+
+# Sequence used to tag each tool call for fair request scheduling
+call_ids = itertools.count(1)
+
+# Background tasks that keep the local search index and Jira mirror in sync
+sync_task: asyncio.Task | None = None
+mirror_task: asyncio.Task | None = None
+
+# Background task sampling event-loop lag
+lag_task: asyncio.Task | None = None
+
+# Seconds between attempts to take over syncing from another process
+SYNC_CLAIM_INTERVAL = 60.0
+
+# Open lock files held by this process, one per database it syncs
+sync_locks: list[Any] = []
+
 
 async def get_client() -> AtlassianClient:
     """Get or create the Atlassian client."""
-    global client
+    global client, sync_task, mirror_task, lag_task
     if client is None:
         config = AtlassianConfig.from_env()
         client = AtlassianClient(config)
+        lag_task = asyncio.create_task(client.loop_lag.run())
+        if client.sync is not None:
+            sync_task = asyncio.create_task(
+                run_exclusively(client.search_index.path, client.sync.run))
+        if client.jira_mirror is not None:
+            mirror_task = asyncio.create_task(
+                run_exclusively(client.jira_mirror.store.path, client.jira_mirror.run))
     return client
 
 
+def claim_sync(path: str) -> bool:
+    """
+    Try to become the one process on this host that syncs a database.
+
+    Takes a non-blocking exclusive lock on "<path>.lock" and holds it for
+    the life of the process, so when several server processes or workers
+    share an index or mirror only one of them polls Atlassian for it.
+    Always succeeds for in-memory databases and where fcntl is unavailable.
+    """
+    if path == ":memory:" or fcntl is None:
+        return True
+    lock = open(f"{path}.lock", "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    sync_locks.append(lock)
+    return True
+
+
+async def run_exclusively(path: str, run: Any) -> None:
+    """Run a sync loop once this process holds the sync lock for path."""
+    if not claim_sync(path):
+        logger.info(f"Another process is syncing {path}; reading it only")
+        while not claim_sync(path):
+            await asyncio.sleep(SYNC_CLAIM_INTERVAL)
+        logger.info(f"Took over syncing {path}")
+    await run()
+
+
+async def get_serializer() -> Serializer:
+    """Get or create the output serializer."""
+    global serializer
+    if serializer is None:
+        config = (await get_client()).config
+        serializer = Serializer(config.output_format, config.json_backend)
+    return serializer
+
+
+async def get_slimmer() -> Slimmer:
+    """Get or create the output slimming transform."""
+    global slimmer
+    if slimmer is None:
+        config = (await get_client()).config
+        slimmer = Slimmer(config.slim_keys if config.slim_output else ())
+    return slimmer
+
+
+async def get_session_limiter() -> SessionLimiter:
+    """Get or create the per-session tool call limiter."""
+    global sessions
+    if sessions is None:
+        config = (await get_client()).config
+        sessions = SessionLimiter(config.session_max_concurrency)
+    return sessions
+
+
+def current_session() -> Any:
+    """Return the client session of the request being handled, if any."""
+    try:
+        return server.request_context.session
+    except LookupError:
+        return None
+
+
+async def render(value: Any, format: str | None = None) -> str:
+    """Slim a client result and serialize it for output, offloading large results."""
+    transform = await get_slimmer()
+    output = await get_serializer()
+    offload = (await get_client()).offload
+
+    def build() -> str:
+        result, removed = transform.slim(value)
+        text = output.dumps(result, format)
+        transform.record(removed, len(text.encode("utf-8")))
+        return text
+
+    return await offload.run(offload.measure(value), build)
+
+
 # Initialize the MCP server
 server = Server("atlassian-mcp")
 
+# Send a progress notification every this many streamed results
+PROGRESS_INTERVAL = 50
+
+
+async def report_progress(progress: int, total: int | None = None) -> None:
+    """Send a progress notification if the current request asked for one."""
+    try:
+        context = server.request_context
+    except LookupError:
+        return
+    if context.meta is None or context.meta.progressToken is None:
+        return
+    await context.session.send_progress_notification(
+        context.meta.progressToken, progress, total)
+
+
+async def stream_json_array(items: AsyncIterator[Any], total: int | None = None,
+                            format: str | None = None) -> str:
+    """Serialize results as they are yielded so only one page is held at a time."""
+    output = await get_serializer()
+    parts = []
+    async for item in items:
+        parts.append(await render(item, format))
+        if len(parts) % PROGRESS_INTERVAL == 0:
+            await report_progress(len(parts), total)
+    return output.join(parts, format)
+
+
+def make_budget(arguments: dict[str, Any]) -> Budget | None:
+    """Build the output budget requested by a tool call, if any."""
+    max_tokens = arguments.get("max_tokens")
+    max_bytes = arguments.get("max_bytes")
+    if max_tokens is None and max_bytes is None:
+        return None
+    return Budget(max_tokens, max_bytes)
+
+
+async def respond(name: str, value: Any, arguments: dict[str, Any]) -> list[TextContent]:
+    """
+    Slim, budget and serialize a client result.
+
+    With max_tokens/max_bytes the result is trimmed to fit, and a second
+    content item lists what was left out together with a cursor; calling the
+    tool again with the same arguments and that cursor returns the omitted
+    parts. The cursor records a digest of the full result, and is rejected
+    if the result has changed in the meantime.
+    """
+    format = arguments.get("format")
+    budget = make_budget(arguments)
+    cursor = arguments.get("cursor")
+    parts, version = decode_cursor(cursor, name) if cursor else (None, None)
+    transform = await get_slimmer()
+    output = await get_serializer()
+
+    def build() -> list[TextContent]:
+        result, removed = transform.slim(value)
+        omitted: list[dict[str, Any]] = []
+        current = digest(result) if parts is not None or budget is not None else None
+        if parts is not None:
+            if version != current:
+                raise ValueError("The result has changed since the cursor was issued; "
+                                 "repeat the call without a cursor")
+            result, omitted = (budget or Budget()).take(result, parts)
+        elif budget is not None:
+            result, omitted = budget.trim(result)
+
+        text = output.dumps(result, format)
+        if parts is None and not omitted:
+            # Trimmed output would understate what slimming saved
+            transform.record(removed, len(text.encode("utf-8")))
+        contents = [TextContent(type="text", text=text)]
+        if omitted:
+            contents.append(TextContent(type="text", text=output.dumps({
+                "truncated": True,
+                "omitted": omitted,
+                "cursor": encode_cursor(name, omitted, current),
+            }, format)))
+        return contents
+
+    # Slimming, budgeting and encoding a large result leave the event loop
+    offload = (await get_client()).offload
+    return await offload.run(offload.measure(value), build)
+
+
+async def respond_stream(name: str, items: AsyncIterator[Any], total: int | None,
+                         arguments: dict[str, Any]) -> list[TextContent]:
+    """Respond with a streamed list, collecting it first when it must be budgeted."""
+    if make_budget(arguments) is None and not arguments.get("cursor"):
+        text = await stream_json_array(items, total, arguments.get("format"))
+        return [TextContent(type="text", text=text)]
+
+    results = []
+    async for item in items:
+        results.append(item)
+        if len(results) % PROGRESS_INTERVAL == 0:
+            await report_progress(len(results), total)
+    return await respond(name, results, arguments)
+
+
+# Shared input schema properties for every tool
+OUTPUT_PROPERTIES = {
+    "format": {
+        "type": "string",
+        "enum": list(FORMATS),
+        "description": "Output format: compact JSON (default) or pretty-printed JSON"
+    },
+    "max_tokens": {
+        "type": "integer",
+        "description": "Approximate token budget for the response; low-priority sections "
+                       "(changelog, old comments, attachments) are trimmed first"
+    },
+    "max_bytes": {
+        "type": "integer",
+        "description": "Byte budget for the response, measured as compact JSON"
+    },
+    "cursor": {
+        "type": "string",
+        "description": "Continuation cursor from a truncated response; repeat the call "
+                       "with the same arguments to fetch the omitted parts"
+    },
+}
+
+# Shared input schema properties for Confluence page reads
+CONFLUENCE_BODY_PROPERTIES = {
+    "body_format": {
+        "type": "string",
+        "enum": list(BODY_FORMATS),
+        "description": "Page body format: raw storage XHTML, markdown or plain text; "
+                       "defaults to the server-wide body format"
+    },
+}
+
+# Shared input schema properties for Jira issue reads
+JIRA_PROJECTION_PROPERTIES = {
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Issue fields to return (e.g., summary, status); overrides the profile"
+    },
+    "expand": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Entities to expand (e.g., changelog, renderedFields); overrides the profile"
+    },
+    "profile": {
+        "type": "string",
+        "enum": list(JIRA_PROFILES),
+        "description": "Field/expand profile to use; defaults to the server-wide profile"
+    },
+    "body_format": {
+        "type": "string",
+        "enum": list(DOCUMENT_FORMATS),
+        "description": "Rich-text fields (description, comments) as raw ADF JSON, "
+                       "markdown or plain text; defaults to the server-wide body format"
+    },
+}
+
 
 @server.list_resources()
 async def handle_list_resources() -> list[Resource]:
@@ -50,33 +337,100 @@ async def handle_list_resources() -> list[Resource]:
             description="Access to Jira issues",
             mimeType="application/json",
         ),
+        Resource(
+            uri="atlassian://stats",
+            name="Client Statistics",
+            description="Cache and request statistics for the Atlassian client",
+            mimeType="application/json",
+        ),
+    ]
+
+
+@server.list_resource_templates()
+async def handle_list_resource_templates() -> list[ResourceTemplate]:
+    """List parameterized resources."""
+    return [
+        ResourceTemplate(
+            uriTemplate="confluence://page/{page_id}",
+            name="Confluence Page",
+            description="A Confluence page by ID",
+            mimeType="application/json",
+        ),
+        ResourceTemplate(
+            uriTemplate="confluence://page/{page_id}/chunks",
+            name="Confluence Page Outline",
+            description="The heading-aligned chunks of a Confluence page body",
+            mimeType="application/json",
+        ),
+        ResourceTemplate(
+            uriTemplate="confluence://page/{page_id}/chunk/{chunk}",
+            name="Confluence Page Chunk",
+            description="One heading-aligned chunk of a Confluence page body as Markdown",
+            mimeType="application/json",
+        ),
+        ResourceTemplate(
+            uriTemplate="jira://issue/{issue_key}",
+            name="Jira Issue",
+            description="A Jira issue by key",
+            mimeType="application/json",
+        ),
     ]
 
 
 @server.read_resource()
-async def handle_read_resource(uri: str) -> str:
+async def handle_read_resource(uri: Any) -> str:
     """Read a specific resource."""
-    parsed = urlparse(uri)
+    # The URI may arrive as a pydantic AnyUrl
+    parsed = urlparse(str(uri))
+    # "confluence://page/123" puts "page" in the netloc; "confluence:///page/123"
+    # puts it in the path
+    segments = [part for part in f"{parsed.netloc}{parsed.path}".split("/") if part]
 
     if parsed.scheme == "confluence":
-        if parsed.path.startswith("/page/"):
-            page_id = parsed.path.split("/")[-1]
+        if len(segments) == 2 and segments[0] == "page":
+            client_instance = await get_client()
+            page_data = await client_instance.confluence_get_page(segments[1])
+            return await render(page_data)
+        elif len(segments) == 3 and segments[0] == "page" and segments[2] == "chunks":
             client_instance = await get_client()
-            page_data = await client_instance.confluence_get_page(page_id)
-            return json.dumps(page_data, indent=2)
+            outline = await client_instance.confluence_get_page_chunk(segments[1])
+            return await render(outline)
+        elif (len(segments) == 4 and segments[0] == "page"
+                and segments[2] == "chunk" and segments[3].isdigit()):
+            client_instance = await get_client()
+            chunk = await client_instance.confluence_get_page_chunk(
+                segments[1], int(segments[3]))
+            return await render(chunk)
         else:
             raise ValueError(
                 f"Invalid Confluence resource path: {parsed.path}")
 
     elif parsed.scheme == "jira":
-        if parsed.path.startswith("/issue/"):
-            issue_key = parsed.path.split("/")[-1]
+        if len(segments) == 2 and segments[0] == "issue":
+            issue_key = segments[1]
             client_instance = await get_client()
             issue_data = await client_instance.jira_get_issue(issue_key)
-            return json.dumps(issue_data, indent=2)
+            return await render(issue_data)
         else:
             raise ValueError(f"Invalid Jira resource path: {parsed.path}")
 
+    elif parsed.scheme == "atlassian":
+        if segments == ["stats"]:
+            client_instance = await get_client()
+            output = await get_serializer()
+            stats = {
+                **(await client_instance.stats()),
+                "sessions": (await get_session_limiter()).stats(),
+                "process": {"pid": os.getpid(), "syncing": [lock.name for lock in sync_locks]},
+                "output": {
+                    "serializer": output.stats(),
+                    "slimmer": (await get_slimmer()).stats(),
+                },
+            }
+            return output.dumps(stats, "pretty")
+        else:
+            raise ValueError(f"Invalid Atlassian resource: {uri}")
+
     else:
         raise ValueError(f"Unknown resource scheme: {parsed.scheme}")
 
@@ -95,11 +449,50 @@ async def handle_list_tools() -> list[Tool]:
                     "page_id": {
                         "type": "string",
                         "description": "The ID of the Confluence page"
-                    }
+                    },
+                    **CONFLUENCE_BODY_PROPERTIES,
+                    **OUTPUT_PROPERTIES
                 },
                 "required": ["page_id"]
             }
         ),
+        Tool(
+            name="confluence_get_page_chunk",
+            description="Get one heading-aligned chunk of a Confluence page body as "
+                        "Markdown; omit chunk to get the page outline",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "page_id": {
+                        "type": "string",
+                        "description": "The ID of the Confluence page"
+                    },
+                    "chunk": {
+                        "type": "integer",
+                        "description": "Index of the chunk to return; omit to list "
+                                       "the chunks with their headings and sizes"
+                    },
+                    **OUTPUT_PROPERTIES
+                },
+                "required": ["page_id"]
+            }
+        ),
+        Tool(
+            name="confluence_get_pages",
+            description="Get several Confluence pages by ID in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "page_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The IDs of the Confluence pages"
+                    },
+                    **OUTPUT_PROPERTIES
+                },
+                "required": ["page_ids"]
+            }
+        ),
         Tool(
             name="confluence_search_pages",
             description="Search for pages in Confluence",
@@ -110,11 +503,17 @@ async def handle_list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Search query for pages"
                     },
+                    "space": {
+                        "type": "string",
+                        "description": "Restrict the search to one space key"
+                    },
                     "limit": {
                         "type": "integer",
-                        "description": "Maximum number of results to return",
+                        "description": "Maximum number of results to return; "
+                                       "large limits are fetched page by page",
                         "default": 10
-                    }
+                    },
+                    **OUTPUT_PROPERTIES
                 },
                 "required": ["query"]
             }
@@ -127,9 +526,11 @@ async def handle_list_tools() -> list[Tool]:
                 "properties": {
                     "limit": {
                         "type": "integer",
-                        "description": "Maximum number of spaces to return",
+                        "description": "Maximum number of spaces to return; "
+                                       "large limits are fetched page by page",
                         "default": 50
-                    }
+                    },
+                    **OUTPUT_PROPERTIES
                 }
             }
         ),
@@ -142,7 +543,9 @@ async def handle_list_tools() -> list[Tool]:
                     "url": {
                         "type": "string",
                         "description": "The full URL of the Confluence page"
-                    }
+                    },
+                    **CONFLUENCE_BODY_PROPERTIES,
+                    **OUTPUT_PROPERTIES
                 },
                 "required": ["url"]
             }
@@ -157,11 +560,30 @@ async def handle_list_tools() -> list[Tool]:
                     "issue_key": {
                         "type": "string",
                         "description": "The key of the Jira issue (e.g., PROJ-123)"
-                    }
+                    },
+                    **JIRA_PROJECTION_PROPERTIES,
+                    **OUTPUT_PROPERTIES
                 },
                 "required": ["issue_key"]
             }
         ),
+        Tool(
+            name="jira_get_issues",
+            description="Get several Jira issues by key in one call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "issue_keys": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The keys of the Jira issues (e.g., PROJ-123)"
+                    },
+                    **JIRA_PROJECTION_PROPERTIES,
+                    **OUTPUT_PROPERTIES
+                },
+                "required": ["issue_keys"]
+            }
+        ),
         Tool(
             name="jira_search_issues",
             description="Search for issues using JQL (Jira Query Language)",
@@ -174,9 +596,12 @@ async def handle_list_tools() -> list[Tool]:
                     },
                     "limit": {
                         "type": "integer",
-                        "description": "Maximum number of results to return",
+                        "description": "Maximum number of results to return; "
+                                       "large limits are fetched page by page",
                         "default": 10
-                    }
+                    },
+                    **JIRA_PROJECTION_PROPERTIES,
+                    **OUTPUT_PROPERTIES
                 },
                 "required": ["jql"]
             }
@@ -186,7 +611,9 @@ async def handle_list_tools() -> list[Tool]:
             description="List all available Jira projects",
             inputSchema={
                 "type": "object",
-                "properties": {}
+                "properties": {
+                    **OUTPUT_PROPERTIES
+                }
             }
         ),
         Tool(
@@ -198,7 +625,9 @@ async def handle_list_tools() -> list[Tool]:
                     "url": {
                         "type": "string",
                         "description": "The full URL of the Jira issue"
-                    }
+                    },
+                    **JIRA_PROJECTION_PROPERTIES,
+                    **OUTPUT_PROPERTIES
                 },
                 "required": ["url"]
             }
@@ -208,50 +637,116 @@ async def handle_list_tools() -> list[Tool]:
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    """Handle tool calls."""
+    """Handle tool calls, queueing those beyond an HTTP session's concurrency limit."""
+    if not limit_sessions:
+        return await call_tool(name, arguments)
+    limiter = await get_session_limiter()
+    async with limiter.slot(current_session()):
+        return await call_tool(name, arguments)
+
+
+async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+    """Run a tool call against the shared client."""
     client_instance = await get_client()
+    current_caller.set(next(call_ids))
 
     try:
         if name == "confluence_get_page":
             page_id = arguments["page_id"]
-            result = await client_instance.confluence_get_page(page_id)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            result = await client_instance.confluence_get_page(
+                page_id, arguments.get("body_format"))
+            return await respond(name, result, arguments)
+
+        elif name == "confluence_get_page_chunk":
+            page_id = arguments["page_id"]
+            result = await client_instance.confluence_get_page_chunk(
+                page_id, arguments.get("chunk"))
+            return await respond(name, result, arguments)
+
+        elif name == "confluence_get_pages":
+            page_ids = arguments["page_ids"]
+            result = await client_instance.confluence_get_pages(page_ids)
+            return await respond(name, result, arguments)
 
         elif name == "confluence_search_pages":
             query = arguments["query"]
             limit = arguments.get("limit", 10)
-            result = await client_instance.confluence_search_pages(query, limit)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return await respond_stream(
+                name,
+                client_instance.iter_confluence_pages(
+                    query, limit, space=arguments.get("space")),
+                limit,
+                arguments,
+            )
 
         elif name == "confluence_list_spaces":
             limit = arguments.get("limit", 50)
-            result = await client_instance.confluence_list_spaces(limit)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return await respond_stream(
+                name,
+                client_instance.iter_confluence_spaces(limit),
+                limit,
+                arguments,
+            )
 
         elif name == "confluence_get_page_by_url":
             url = arguments["url"]
-            result = await client_instance.confluence_get_page_by_url(url)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            result = await client_instance.confluence_get_page_by_url(
+                url, arguments.get("body_format"))
+            return await respond(name, result, arguments)
 
         elif name == "jira_get_issue":
             issue_key = arguments["issue_key"]
-            result = await client_instance.jira_get_issue(issue_key)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            result = await client_instance.jira_get_issue(
+                issue_key,
+                fields=arguments.get("fields"),
+                expand=arguments.get("expand"),
+                profile=arguments.get("profile"),
+                body_format=arguments.get("body_format"),
+            )
+            return await respond(name, result, arguments)
+
+        elif name == "jira_get_issues":
+            issue_keys = arguments["issue_keys"]
+            result = await client_instance.jira_get_issues(
+                issue_keys,
+                fields=arguments.get("fields"),
+                expand=arguments.get("expand"),
+                profile=arguments.get("profile"),
+                body_format=arguments.get("body_format"),
+            )
+            return await respond(name, result, arguments)
 
         elif name == "jira_search_issues":
             jql = arguments["jql"]
             limit = arguments.get("limit", 10)
-            result = await client_instance.jira_search_issues(jql, limit)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return await respond_stream(
+                name,
+                client_instance.iter_jira_issues(
+                    jql,
+                    limit,
+                    fields=arguments.get("fields"),
+                    expand=arguments.get("expand"),
+                    profile=arguments.get("profile"),
+                    body_format=arguments.get("body_format"),
+                ),
+                limit,
+                arguments,
+            )
 
         elif name == "jira_list_projects":
             result = await client_instance.jira_list_projects()
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return await respond(name, result, arguments)
 
         elif name == "jira_get_issue_by_url":
             url = arguments["url"]
-            result = await client_instance.jira_get_issue_by_url(url)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            result = await client_instance.jira_get_issue_by_url(
+                url,
+                fields=arguments.get("fields"),
+                expand=arguments.get("expand"),
+                profile=arguments.get("profile"),
+                body_format=arguments.get("body_format"),
+            )
+            return await respond(name, result, arguments)
 
         else:
             raise ValueError(f"Unknown tool: {name}")
@@ -261,22 +756,124 @@ async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[TextCon
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
+def initialization_options() -> InitializationOptions:
+    """Return the options announced to clients when a session starts."""
+    return InitializationOptions(
+        server_name="atlassian-mcp",
+        server_version="0.1.0",
+        capabilities=ServerCapabilities(
+            resources={},
+            tools={},
+            prompts={}
+        )
+    )
+
+
 async def main():
     """Main entry point for the server."""
     async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="atlassian-mcp",
-                server_version="0.1.0",
-                capabilities=ServerCapabilities(
-                    resources={},
-                    tools={},
-                    prompts={}
-                )
-            )
-        )
+        await server.run(read_stream, write_stream, initialization_options())
+
+
+class _ASGIEndpoint:
+    """Wraps an ASGI callable so Starlette routes requests to it unchanged."""
+
+    def __init__(self, handle: Any):
+        self.handle = handle
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.handle(scope, receive, send)
+
+
+def create_http_app(transport: str = "streamable-http", stateless: bool = False) -> Any:
+    """
+    Build an ASGI app serving MCP sessions over HTTP.
+
+    "streamable-http" serves the MCP Streamable HTTP transport at /mcp;
+    "sse" serves the older HTTP+SSE transport (GET /sse, POST /messages/).
+    Every session shares this process's client, so caches, connection
+    pools, rate limits and the sync engines are shared as well, and each
+    session may run at most session_max_concurrency tool calls at once. With
+    stateless, each Streamable HTTP request is handled on its own, so any
+    process behind a shared socket can answer it; the per-session limit
+    does not apply then.
+    """
+    global limit_sessions
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Mount, Route
+
+    if transport not in HTTP_TRANSPORTS:
+        raise ValueError(
+            f"Unknown transport: {transport}. "
+            f"Expected one of: {', '.join(HTTP_TRANSPORTS)}")
+    # A stateless request is a session of its own, so there is nothing to limit
+    limit_sessions = not stateless
+
+    if transport == "sse":
+        from mcp.server.sse import SseServerTransport
+
+        sse = SseServerTransport("/messages/")
+
+        async def handle_sse(request: Any) -> Response:
+            async with sse.connect_sse(
+                    request.scope, request.receive, request._send) as (read_stream, write_stream):
+                await server.run(read_stream, write_stream, initialization_options())
+            return Response()
+
+        return Starlette(routes=[
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message),
+        ])
+
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+    manager = StreamableHTTPSessionManager(app=server, stateless=stateless)
+
+    @asynccontextmanager
+    async def lifespan(app: Any) -> AsyncIterator[None]:
+        async with manager.run():
+            yield
+
+    return Starlette(
+        routes=[Route("/mcp", endpoint=_ASGIEndpoint(manager.handle_request))],
+        lifespan=lifespan,
+    )
+
+
+async def serve_http(transport: str = "streamable-http", host: str = "127.0.0.1",
+                     port: int = 8000) -> None:
+    """Serve MCP sessions over HTTP until interrupted."""
+    import uvicorn
+
+    app = create_http_app(transport)
+    config = uvicorn.Config(app, host=host, port=port, log_level="info")
+    await uvicorn.Server(config).serve()
+
+
+def create_worker_app() -> Any:
+    """Build the stateless Streamable HTTP app run by each worker process."""
+    return create_http_app("streamable-http", stateless=True)
+
+
+def serve_workers(host: str = "127.0.0.1", port: int = 8000, workers: int = 2) -> None:
+    """
+    Serve Streamable HTTP from a pool of worker processes until interrupted.
+
+    The parent binds the socket and starts workers that accept connections
+    from it, restarting any that exit. Requests from one MCP session can
+    reach any worker, so workers run stateless and the per-session limit
+    does not apply. Unless a cache backend is configured, workers share the
+    disk cache so adding workers does not multiply upstream requests; only
+    one of them runs each sync loop. Each worker enforces an equal share of
+    the configured rate and in-flight limits.
+    """
+    import uvicorn
+
+    os.environ.setdefault("ATLASSIAN_CACHE_BACKEND", "disk")
+    os.environ["ATLASSIAN_WORKER_PROCESSES"] = str(workers)
+    uvicorn.run("atlassian_mcp.server:create_worker_app", factory=True,
+                host=host, port=port, workers=workers, log_level="info")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,337 @@
+"""Convert Confluence storage format (XHTML with macros) to Markdown or plain text."""
+
+import html
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+from .markdown import WHITESPACE, MarkdownEmitter
+
+# Body formats accepted by confluence_get_page; "storage" returns the raw XHTML
+BODY_FORMATS = ("storage", "markdown", "text")
+
+# Macros rendered as a titled callout around their rich-text body
+_PANEL_MACROS = {"info", "note", "warning", "tip", "panel", "expand"}
+
+# Macros whose plain-text body is code
+_CODE_MACROS = {"code", "noformat"}
+
+# Elements whose content never reaches the output
+_SKIPPED = {"ac:placeholder", "ac:emoticon", "style", "script", "colgroup", "col"}
+
+# Containers where whitespace between child elements is insignificant
+_BLOCK_CONTAINERS = {
+    "root", "ul", "ol", "table", "thead", "tbody", "tfoot", "tr", "blockquote",
+    "div", "section", "ac:structured-macro", "ac:rich-text-body", "ac:task-list",
+    "ac:task", "ac:layout", "ac:layout-section", "ac:layout-cell",
+}
+
+_CDATA = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+
+
+class _Frame:
+    """An open element whose rendered children are collected in parts."""
+    __slots__ = ("tag", "attrs", "parts", "extra")
+
+    def __init__(self, tag: str, attrs: Dict[str, str]):
+        self.tag = tag
+        self.attrs = attrs
+        self.parts: List[str] = []
+        self.extra: Dict[str, Any] = {}
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+class StorageConverter(HTMLParser, MarkdownEmitter):
+    """Event-driven converter from storage format to Markdown or plain text.
+
+    Each open element is a frame on a stack; when it closes its collected
+    content is rendered and appended to the parent frame, so nested lists,
+    tables, panels and macros compose without building a DOM.
+    """
+
+    def __init__(self, mode: str = "markdown"):
+        super().__init__(convert_charrefs=True)
+        if mode not in ("markdown", "text"):
+            raise ValueError(f"Unknown conversion mode: {mode}")
+        self.markdown = mode == "markdown"
+        self.stack: List[_Frame] = [_Frame("root", {})]
+        self.preserve = 0
+        self.skip = 0
+
+    # Parser events
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        attributes = {name: value or "" for name, value in attrs}
+        if tag in _SKIPPED:
+            self.skip += 1
+            return
+        if tag in ("br",):
+            self._emit("\n")
+            return
+        if tag == "hr":
+            self._emit("\n\n---\n\n" if self.markdown else "\n\n")
+            return
+        if tag.startswith("ri:"):
+            self._resource(tag, attributes)
+            return
+        if tag in ("pre", "ac:plain-text-body", "ac:plain-text-link-body"):
+            self.preserve += 1
+        self.stack.append(_Frame(tag, attributes))
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in ("br", "hr") and not tag.startswith("ri:"):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED:
+            self.skip = max(self.skip - 1, 0)
+            return
+        if tag in ("br", "hr") or tag.startswith("ri:"):
+            return
+        # Tolerate unbalanced markup by closing frames up to the matching tag
+        if not any(frame.tag == tag for frame in self.stack[1:]):
+            return
+        while True:
+            frame = self.stack.pop()
+            if frame.tag in ("pre", "ac:plain-text-body", "ac:plain-text-link-body"):
+                self.preserve -= 1
+            self._close(frame)
+            if frame.tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self.skip:
+            return
+        data = data.replace("\xa0", " ")
+        if not self.preserve:
+            if not data.strip() and self.stack[-1].tag in _BLOCK_CONTAINERS:
+                return
+            data = WHITESPACE.sub(" ", data)
+        self._emit(data)
+
+    # Helpers
+    def _emit(self, text: str) -> None:
+        if not self.skip:
+            self.stack[-1].parts.append(text)
+
+    def _nearest(self, *tags: str) -> Optional[_Frame]:
+        for frame in reversed(self.stack):
+            if frame.tag in tags:
+                return frame
+        return None
+
+    def _resource(self, tag: str, attrs: Dict[str, str]) -> None:
+        """Record an ri:* resource reference on the enclosing link or image."""
+        owner = self._nearest("ac:link", "ac:image")
+        if owner is None:
+            if tag == "ri:user":
+                self._emit("@user")
+            return
+        if tag == "ri:url":
+            owner.extra["url"] = attrs.get("ri:value", "")
+        elif tag == "ri:page":
+            owner.extra["title"] = attrs.get("ri:content-title", "")
+        elif tag == "ri:attachment":
+            owner.extra["title"] = attrs.get("ri:filename", "")
+        elif tag == "ri:user":
+            owner.extra["title"] = "@user"
+        elif tag == "ri:space":
+            owner.extra.setdefault("title", attrs.get("ri:space-key", ""))
+
+    def _inline(self, marker: str, text: str) -> str:
+        if not self.markdown or not text.strip():
+            return text
+        # Keep surrounding spaces outside the markers
+        stripped = text.strip()
+        lead = " " if text[:1].isspace() else ""
+        trail = " " if text[-1:].isspace() else ""
+        return f"{lead}{marker}{stripped}{marker}{trail}"
+
+    def _close(self, frame: _Frame) -> None:
+        rendered = self._render(frame)
+        if rendered:
+            self._emit(rendered)
+
+    def _render(self, frame: _Frame) -> str:
+        tag = frame.tag
+        content = frame.text()
+
+        if len(tag) == 2 and tag[0] == "h" and tag[1].isdigit():
+            return self._heading(int(tag[1]), content)
+        if tag in ("p", "div", "section", "ac:layout", "ac:layout-section", "ac:layout-cell"):
+            return self._block(content)
+        if tag in ("strong", "b"):
+            return self._inline("**", content)
+        if tag in ("em", "i"):
+            return self._inline("*", content)
+        if tag in ("s", "del"):
+            return self._inline("~~", content)
+        if tag == "code":
+            return content if self.preserve else self._inline("`", content)
+        if tag == "a":
+            href = frame.attrs.get("href", "")
+            text = content.strip() or href
+            if self.markdown and href:
+                return f"[{text}]({href})"
+            return text
+        if tag == "time":
+            return frame.attrs.get("datetime", content)
+        if tag in ("ul", "ol", "ac:task-list"):
+            return self._render_list(frame)
+        if tag == "li":
+            return self._render_item(frame, content)
+        if tag == "ac:task":
+            return self._render_task(frame)
+        if tag == "ac:task-status":
+            task = self._nearest("ac:task")
+            if task is not None:
+                task.extra["complete"] = content.strip() == "complete"
+            return ""
+        if tag == "ac:task-body":
+            task = self._nearest("ac:task")
+            if task is not None:
+                task.extra["body"] = content
+            return ""
+        if tag == "pre":
+            return self._code_block(content, "")
+        if tag == "blockquote":
+            return self._quote(content)
+        if tag in ("td", "th"):
+            row = self._nearest("tr")
+            if row is not None:
+                row.extra.setdefault("cells", []).append(self._cell(content))
+                if tag == "th":
+                    row.extra["header"] = True
+            return ""
+        if tag == "tr":
+            table = self._nearest("table")
+            if table is not None:
+                table.extra.setdefault("rows", []).append(
+                    (frame.extra.get("cells", []), frame.extra.get("header", False)))
+            return ""
+        if tag == "table":
+            return self._render_table(frame)
+        if tag == "ac:parameter":
+            macro = self._nearest("ac:structured-macro")
+            if macro is not None:
+                params = macro.extra.setdefault("params", {})
+                params[frame.attrs.get("ac:name", "")] = content.strip()
+            return ""
+        if tag == "ac:plain-text-body":
+            macro = self._nearest("ac:structured-macro")
+            if macro is not None:
+                macro.extra["plain"] = content
+            return ""
+        if tag == "ac:rich-text-body":
+            macro = self._nearest("ac:structured-macro")
+            if macro is not None:
+                macro.extra["rich"] = content
+            return ""
+        if tag == "ac:structured-macro":
+            return self._render_macro(frame)
+        if tag in ("ac:plain-text-link-body", "ac:link-body"):
+            link = self._nearest("ac:link")
+            if link is not None:
+                link.extra["body"] = content
+            return ""
+        if tag == "ac:link":
+            text = (frame.extra.get("body") or "").strip() or frame.extra.get("title", "")
+            url = frame.extra.get("url")
+            if self.markdown and url:
+                return f"[{text or url}]({url})"
+            return text or url or ""
+        if tag == "ac:image":
+            source = frame.extra.get("url") or frame.extra.get("title", "")
+            if self.markdown and source:
+                return f"![{frame.attrs.get('ac:alt', '')}]({source})"
+            return ""
+        return content
+
+    def _render_list(self, frame: _Frame) -> str:
+        items = frame.extra.get("items", [])
+        if not items:
+            return ""
+        # Nested lists sit directly under their parent item
+        if self._nearest("li", "ac:task") is not None:
+            return "\n" + "\n".join(items) + "\n"
+        return self._block("\n".join(items))
+
+    def _list_marker(self) -> str:
+        parent = self._nearest("ul", "ol")
+        if parent is not None and parent.tag == "ol":
+            number = parent.extra.get("count", 0) + 1
+            parent.extra["count"] = number
+            return f"{number}. "
+        return "- "
+
+    def _add_item(self, marker: str, content: str) -> str:
+        item = self._item(marker, content)
+        parent = self._nearest("ul", "ol", "ac:task-list")
+        if parent is not None:
+            parent.extra.setdefault("items", []).append(item)
+            return ""
+        return "\n" + item + "\n"
+
+    def _render_item(self, frame: _Frame, content: str) -> str:
+        return self._add_item(self._list_marker(), content)
+
+    def _render_task(self, frame: _Frame) -> str:
+        done = frame.extra.get("complete", False)
+        marker = ("- [x] " if done else "- [ ] ") if self.markdown else "- "
+        return self._add_item(marker, frame.extra.get("body", ""))
+
+    def _render_table(self, frame: _Frame) -> str:
+        rows = frame.extra.get("rows", [])
+        if not rows:
+            return ""
+        width = max(len(cells) for cells, _ in rows)
+        padded = [cells + [""] * (width - len(cells)) for cells, _ in rows]
+        if not self.markdown:
+            return self._block("\n".join(" | ".join(cells) for cells in padded))
+
+        lines = ["| " + " | ".join(padded[0]) + " |",
+                 "|" + "---|" * width]
+        lines.extend("| " + " | ".join(cells) + " |" for cells in padded[1:])
+        return self._block("\n".join(lines))
+
+    def _render_macro(self, frame: _Frame) -> str:
+        name = frame.attrs.get("ac:name", "")
+        params = frame.extra.get("params", {})
+        if name in _CODE_MACROS:
+            return self._code_block(frame.extra.get("plain", ""), params.get("language", ""))
+        if name in _PANEL_MACROS:
+            title = params.get("title", "")
+            label = name.capitalize()
+            heading = f"{label}: {title}" if title else label
+            if self.markdown:
+                heading = f"**{heading}**"
+            body = (frame.extra.get("rich") or "").strip()
+            return self._quote(f"{heading}\n\n{body}" if body else heading)
+        if name == "jira":
+            return params.get("key", "")
+        if name == "status":
+            return f"[{params.get('title', '')}]"
+        rich = frame.extra.get("rich")
+        if rich is not None:
+            return rich
+        plain = frame.extra.get("plain")
+        return self._code_block(plain, "") if plain else ""
+
+    def result(self) -> str:
+        """Return the converted document."""
+        while len(self.stack) > 1:
+            self._close(self.stack.pop())
+        return self._finish(self.stack[0].text())
+
+
+def convert_storage(storage: str, mode: str = "markdown") -> str:
+    """Convert a storage-format body to Markdown ("markdown") or plain text ("text")."""
+    # CDATA sections hold code and link text; escape them so the parser
+    # reports them as ordinary character data on every Python version
+    storage = _CDATA.sub(lambda m: html.escape(m.group(1), quote=False), storage)
+    converter = StorageConverter(mode)
+    converter.feed(storage)
+    converter.close()
+    return converter.result()
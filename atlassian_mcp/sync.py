@@ -0,0 +1,222 @@
+"""Incremental sync of Confluence spaces into the local search index."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from .index import ALL_SPACES, PageIndex, index_spaces
+from .storage import convert_storage
+
+if TYPE_CHECKING:
+    from .client import AtlassianClient
+
+logger = logging.getLogger(__name__)
+
+
+def cql_datetime(timestamp: float) -> str:
+    """Format an epoch timestamp as a CQL date ("yyyy-MM-dd HH:mm", UTC)."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+class ConfluenceSync:
+    """Keeps the search index current with bounded, incremental fetches.
+
+    A space without a checkpoint is crawled in full, with bodies expanded in
+    the listing. Afterwards each cycle runs a "lastModified >= checkpoint"
+    CQL query and fetches only pages whose version changed, several at a
+    time. Deleted pages do not show up in those queries, so each space is
+    also reconciled against a full version listing once per process start
+    and every reconcile_interval seconds. Checkpoints are stored in the
+    index database and survive restarts.
+
+    CQL compares dates in the Atlassian user's time zone at minute
+    granularity, so each query reaches back overlap seconds before the
+    checkpoint; pages already indexed at their current version are skipped.
+    Pages that could not be fetched are retried on the next poll even if
+    they have dropped out of the overlap window by then.
+    """
+
+    def __init__(
+        self,
+        client: "AtlassianClient",
+        index: PageIndex,
+        spaces: List[str],
+        interval: float = 300.0,
+        concurrency: int = 4,
+        overlap: float = 86400.0,
+        reconcile_interval: float = 86400.0,
+    ):
+        self.client = client
+        self.index = index
+        self.spaces = index_spaces(spaces)
+        self.interval = interval
+        self.overlap = overlap
+        self.reconcile_interval = reconcile_interval
+        self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self._reconciled: Dict[str, float] = {}
+        self._failed: Dict[str, Set[str]] = {}
+
+        self.state = "idle"
+        self.cycles = 0
+        self.errors = 0
+        self.pages_fetched = 0
+        self.pages_deleted = 0
+        self.fetch_seconds = 0.0
+        self.last_cycle: Dict[str, Any] = {}
+
+    async def run(self) -> None:
+        """Sync forever, sleeping interval seconds between cycles."""
+        while True:
+            try:
+                await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                self.state = "error"
+                logger.error(f"Confluence sync failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def sync_once(self) -> None:
+        """Bring every configured space up to date once."""
+        started = time.monotonic()
+        fetched = self.pages_fetched
+        if self.spaces == [ALL_SPACES]:
+            spaces = [space["key"] async for space in self.client.iter_confluence_spaces()]
+        else:
+            spaces = self.spaces
+
+        for space in spaces:
+            await self.sync_space(space)
+        if self.spaces == [ALL_SPACES]:
+            self.index.mark_complete(ALL_SPACES)
+
+        self.cycles += 1
+        self.state = "idle"
+        elapsed = time.monotonic() - started
+        pages = self.pages_fetched - fetched
+        self.last_cycle = {
+            "seconds": round(elapsed, 3),
+            "pages": pages,
+            "pages_per_second": round(pages / elapsed, 2) if elapsed else 0.0,
+        }
+
+    async def sync_space(self, space: str) -> None:
+        """Crawl, reconcile or poll one space and advance its checkpoint."""
+        started = time.time()
+        checkpoint = self.index.checkpoint(space)
+        if checkpoint is None:
+            self.state = "crawling"
+            await self._crawl(space)
+            self._reconciled[space] = started
+        elif started - self._reconciled.get(space, 0.0) >= self.reconcile_interval:
+            self.state = "reconciling"
+            await self._reconcile(space)
+            self._reconciled[space] = started
+        else:
+            self.state = "polling"
+            await self._poll(space, checkpoint)
+        self.index.set_checkpoint(space, started)
+        self.index.mark_complete(space)
+
+    async def _crawl(self, space: str) -> None:
+        """Index every page of a space from a listing with bodies expanded."""
+        known = self.index.versions(space)
+        seen = set()
+        started = time.monotonic()
+        async for page in self.client.iter_confluence_space_pages(space):
+            seen.add(page["id"])
+            if known.get(page["id"]) != self._version(page):
+                await self._store(page)
+        self.fetch_seconds += time.monotonic() - started
+        self._delete(set(known) - seen)
+        logger.info(f"Crawled {len(seen)} pages in Confluence space {space}")
+
+    async def _reconcile(self, space: str) -> None:
+        """Compare a version listing with the index; fetch changes, drop deletions."""
+        known = self.index.versions(space)
+        current = {
+            page["id"]: self._version(page)
+            async for page in self.client.iter_confluence_space_pages(
+                space, expand="version")
+        }
+        changed = [page_id for page_id, version in current.items()
+                   if known.get(page_id) != version]
+        # The full listing supersedes any pending retries
+        self._failed.pop(space, None)
+        await self._fetch(space, changed)
+        self._delete(set(known) - set(current))
+
+    async def _poll(self, space: str, checkpoint: float) -> None:
+        """Fetch the pages modified since the checkpoint."""
+        known = self.index.versions(space)
+        since = cql_datetime(checkpoint - self.overlap)
+        changed = [
+            page["id"]
+            async for page in self.client.iter_confluence_changes(space, since)
+            if known.get(page["id"]) != self._version(page)
+        ]
+        retry = self._failed.pop(space, set())
+        await self._fetch(space, changed + sorted(retry.difference(changed)))
+
+    async def _fetch(self, space: str, page_ids: List[str]) -> None:
+        """Fetch and index pages, at most concurrency at a time.
+
+        Pages that fail are remembered and retried by the next poll of space.
+        """
+        if not page_ids:
+            return
+        started = time.monotonic()
+
+        async def fetch(page_id: str) -> None:
+            async with self._semaphore:
+                try:
+                    page = await self.client.confluence_fetch_page(page_id)
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"Could not sync Confluence page {page_id}: {e}")
+                    self._failed.setdefault(space, set()).add(page_id)
+                    return
+            await self._store(page)
+
+        await asyncio.gather(*(fetch(page_id) for page_id in page_ids))
+        self.fetch_seconds += time.monotonic() - started
+
+    async def _store(self, page: Dict[str, Any]) -> None:
+        storage = ((page.get("body") or {}).get("storage") or {}).get("value") or ""
+        text = await self.client.offload.run(len(storage), convert_storage, storage, "text")
+        self.index.upsert(page, text)
+        self.pages_fetched += 1
+
+    def _delete(self, page_ids: Any) -> None:
+        for page_id in page_ids:
+            self.index.delete(page_id)
+            self.pages_deleted += 1
+
+    @staticmethod
+    def _version(page: Dict[str, Any]) -> Optional[int]:
+        return (page.get("version") or {}).get("number")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return sync progress, throughput and per-space lag in seconds."""
+        now = time.time()
+        lag = {}
+        for space in self.index.covered_spaces():
+            checkpoint = self.index.checkpoint(space)
+            if checkpoint is not None:
+                lag[space] = round(now - checkpoint, 1)
+        return {
+            "state": self.state,
+            "cycles": self.cycles,
+            "errors": self.errors,
+            "pages_fetched": self.pages_fetched,
+            "pages_deleted": self.pages_deleted,
+            "pending_retries": sum(len(ids) for ids in self._failed.values()),
+            "pages_per_second": (
+                round(self.pages_fetched / self.fetch_seconds, 2)
+                if self.fetch_seconds else 0.0),
+            "last_cycle": self.last_cycle,
+            "lag_seconds": lag,
+        }
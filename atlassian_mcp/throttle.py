@@ -0,0 +1,125 @@
+"""Client-side token-bucket throttling for Atlassian API requests."""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+import httpx
+
+from .retry import _parse_reset
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts to the quota the server reports.
+
+    The rate starts at max_rate. It is set from X-RateLimit-Remaining spread
+    over the time to X-RateLimit-Reset when those headers are present, reduced
+    on 429 or X-RateLimit-NearLimit (at most once per decrease_interval, so a
+    burst of responses to the same condition counts once), and grows back
+    additively on responses that carry no quota information.
+    """
+
+    decrease_interval = 1.0
+
+    def __init__(self, max_rate: float, burst: float, min_rate: float = 0.5):
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.rate = max_rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+
+        self.acquired = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._tokens + (now - self._updated) * self.rate, self.burst)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Take a token, sleeping until one is available.
+
+        Tokens are reserved immediately (the balance may go negative), so
+        concurrent callers are served in arrival order.
+        """
+        self._refill()
+        self._tokens -= 1
+        self.acquired += 1
+        if self._tokens >= 0:
+            return
+
+        delay = -self._tokens / self.rate
+        self.throttled += 1
+        self.wait_seconds += delay
+        self.max_wait = max(self.max_wait, delay)
+        await asyncio.sleep(delay)
+
+    def _set_rate(self, rate: float) -> None:
+        self._refill()
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease >= self.decrease_interval:
+            self._last_decrease = now
+            self._set_rate(self.rate * factor)
+
+    def observe(self, response: httpx.Response) -> None:
+        """Adapt the refill rate to a response's status and quota headers."""
+        headers = response.headers
+        if response.status_code == 429:
+            self._decrease(0.5)
+            return
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_in = _parse_reset(headers.get("X-RateLimit-Reset"))
+        if remaining is not None and reset_in is not None and reset_in > 0:
+            try:
+                self._set_rate(float(remaining) / reset_in)
+                return
+            except ValueError:
+                pass
+
+        if headers.get("X-RateLimit-NearLimit", "").lower() == "true":
+            self._decrease(0.75)
+        elif self.rate < self.max_rate:
+            self._set_rate(self.rate + self.max_rate / 20)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 6),
+            "max_wait_seconds": round(self.max_wait, 6),
+        }
+
+
+class Throttle:
+    """Separate adaptive token buckets per product."""
+
+    def __init__(self, rates: Dict[str, float], burst: float):
+        self.buckets = {product: TokenBucket(rate, burst)
+                        for product, rate in rates.items() if rate > 0}
+
+    async def acquire(self, product: str) -> None:
+        """Wait for a token from the product's bucket, if it has one."""
+        bucket = self.buckets.get(product)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def observe(self, product: str, response: httpx.Response) -> None:
+        """Feed a response back into the product's bucket."""
+        bucket = self.buckets.get(product)
+        if bucket is not None:
+            bucket.observe(response)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return rate and time-spent-waiting metrics per product."""
+        return {product: bucket.stats() for product, bucket in self.buckets.items()}
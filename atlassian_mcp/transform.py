@@ -0,0 +1,107 @@
+"""Response transforms applied between the client and the serializer."""
+
+import json
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Hypermedia and presentation keys that carry no content for a model
+DEFAULT_STRIP_KEYS = frozenset({
+    "_links",
+    "_expandable",
+    "self",
+    "avatarUrls",
+    "iconUrl",
+    "expand",
+})
+
+
+class Slimmer:
+    """Removes configured keys from a response at every nesting level.
+
+    Walks the response once with an explicit stack and builds a pruned copy,
+    so cached responses are never mutated and deep documents cannot hit the
+    recursion limit. Each result is transformed on its own, so streamed
+    results can be slimmed item by item.
+
+    The server reports the size of each slimmed result once serialized
+    (see record()), so stats() can show how much output slimming saves.
+    """
+
+    def __init__(self, strip_keys: Optional[Iterable[str]] = None):
+        self.strip_keys = frozenset(
+            DEFAULT_STRIP_KEYS if strip_keys is None else strip_keys)
+
+        self.responses = 0
+        self.keys_removed = 0
+        self.bytes_removed = 0
+        self.bytes_out = 0
+
+    def __call__(self, value: Any) -> Any:
+        """Return a copy of value without the configured keys."""
+        return self.slim(value)[0]
+
+    def slim(self, value: Any) -> Tuple[Any, int]:
+        """
+        Return a copy of value without the configured keys, and the bytes removed.
+
+        The removed size is that of the dropped members as compact JSON.
+        """
+        self.responses += 1
+        if not self.strip_keys or not isinstance(value, (dict, list)):
+            return value, 0
+
+        strip_keys = self.strip_keys
+        removed = 0
+        removed_bytes = 0
+        root: Any = {} if isinstance(value, dict) else []
+        stack = [(value, root)]
+        while stack:
+            source, target = stack.pop()
+            if isinstance(source, dict):
+                for key, item in source.items():
+                    if key in strip_keys:
+                        removed += 1
+                        # "key":value plus the separating comma
+                        removed_bytes += len(key) + 4 + len(json.dumps(
+                            item, separators=(",", ":"), ensure_ascii=False,
+                            default=str).encode("utf-8"))
+                        continue
+                    if isinstance(item, dict):
+                        target[key] = child = {}
+                        stack.append((item, child))
+                    elif isinstance(item, list):
+                        target[key] = child = []
+                        stack.append((item, child))
+                    else:
+                        target[key] = item
+            else:
+                for item in source:
+                    if isinstance(item, dict):
+                        child = {}
+                        stack.append((item, child))
+                        target.append(child)
+                    elif isinstance(item, list):
+                        child = []
+                        stack.append((item, child))
+                        target.append(child)
+                    else:
+                        target.append(item)
+
+        self.keys_removed += removed
+        return root, removed_bytes
+
+    def record(self, removed: int, output: int) -> None:
+        """Record the bytes slim() removed from a result and its serialized size."""
+        self.bytes_removed += removed
+        self.bytes_out += output
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how many responses were slimmed, and the keys and bytes removed."""
+        before = self.bytes_out + self.bytes_removed
+        return {
+            "strip_keys": sorted(self.strip_keys),
+            "responses": self.responses,
+            "keys_removed": self.keys_removed,
+            "bytes_before": before,
+            "bytes_after": self.bytes_out,
+            "saved_percent": round(self.bytes_removed / before * 100, 2) if before else 0.0,
+        }
@@ -0,0 +1,123 @@
+"""HTTP transport construction and connection statistics."""
+
+import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def create_http_client(
+    headers: Optional[Dict[str, str]] = None,
+    http2: bool = True,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 60.0,
+    connect_timeout: float = 10.0,
+    read_timeout: float = 30.0,
+    write_timeout: float = 30.0,
+    pool_timeout: float = 30.0,
+) -> httpx.AsyncClient:
+    """
+    Create an AsyncClient with explicit pool limits and timeouts.
+
+    HTTP/2 is only enabled when the optional h2 package is installed
+    (pip install atlassian-mcp[http2]); otherwise HTTP/1.1 is used.
+    Cookies are never stored: Confluence and Jira share the client but
+    authenticate separately, so a cookie set in response to one product's
+    token must not be sent with the other's requests.
+    """
+    if http2 and not HTTP2_AVAILABLE:
+        logger.info(
+            "HTTP/2 requested but the 'h2' package is not installed; "
+            "falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        headers=headers,
+        # A jar whose policy accepts no domain drops every Set-Cookie
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=write_timeout,
+            pool=pool_timeout,
+        ),
+    )
+
+
+class ProductClient:
+    """Per-product view of a shared AsyncClient.
+
+    Requests go through the shared connection pool with the product's own
+    headers (its Authorization) attached, so Confluence and Jira reuse the
+    same connections to the domain while keeping separate tokens.
+    """
+
+    def __init__(self, product: str, http_client: httpx.AsyncClient,
+                 headers: Dict[str, str]):
+        self.product = product
+        self.http_client = http_client
+        self.headers = headers
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  **kwargs: Any) -> httpx.Response:
+        """Send a GET request with the product's headers attached."""
+        return await self.http_client.get(
+            url, headers={**self.headers, **(headers or {})}, **kwargs)
+
+
+class ConnectionStats:
+    """Counts new connections versus reused ones using httpcore trace events.
+
+    Pass trace as the "trace" request extension on each request.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.http2_requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.connect_failures = 0
+
+    async def trace(self, event: str, info: Dict[str, Any]) -> None:
+        """httpcore trace callback."""
+        if event == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event == "connection.connect_tcp.failed":
+            self.connect_failures += 1
+        elif event == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+        elif event == "http11.send_request_headers.started":
+            self.requests += 1
+        elif event == "http2.send_request_headers.started":
+            self.requests += 1
+            self.http2_requests += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection reuse statistics."""
+        reused = max(self.requests - self.connections_opened, 0)
+        return {
+            "http2_available": HTTP2_AVAILABLE,
+            "requests": self.requests,
+            "http2_requests": self.http2_requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "connect_failures": self.connect_failures,
+            "reused_requests": reused,
+            "reuse_ratio": reused / self.requests if self.requests else 0.0,
+        }
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool output serializers.
+Compares output size and encode time of the previous json.dumps(indent=2)
+output against the compact and pretty formats of each available backend,
+with and without the response slimming transform.
+
+Usage:
+  python benchmark_serializers.py                 # synthetic issue and page payloads
+  python benchmark_serializers.py response.json   # a saved API response
+"""
+
+import json
+import sys
+import timeit
+
+from atlassian_mcp.serialize import ORJSON_AVAILABLE, Serializer
+from atlassian_mcp.transform import Slimmer
+
+
+def make_issue(n: int) -> dict:
+    """Build a Jira issue shaped like a REST v3 response with a changelog."""
+    user = {
+        "self": "https://example.atlassian.net/rest/api/3/user?accountId=abc123",
+        "accountId": "abc123",
+        "displayName": "Example User",
+        "avatarUrls": {size: f"https://avatar.example.com/{size}.png"
+                       for size in ("48x48", "24x24", "16x16", "32x32")},
+        "active": True,
+    }
+    return {
+        "id": str(10000 + n),
+        "key": f"PROJ-{n}",
+        "self": f"https://example.atlassian.net/rest/api/3/issue/{10000 + n}",
+        "fields": {
+            "summary": f"Investigate latency regression in service {n}",
+            "status": {"name": "In Progress", "id": "3"},
+            "assignee": user,
+            "reporter": user,
+            "labels": ["backend", "performance"],
+            "issuetype": {
+                "self": "https://example.atlassian.net/rest/api/3/issuetype/1",
+                "iconUrl": "https://example.atlassian.net/images/icons/bug.svg",
+                "name": "Bug",
+            },
+            "description": {
+                "type": "doc",
+                "version": 1,
+                "content": [{
+                    "type": "paragraph",
+                    "content": [{"type": "text", "text": "Steps to reproduce " * 20}],
+                }],
+            },
+        },
+        "changelog": {
+            "histories": [{
+                "id": str(i),
+                "author": user,
+                "created": "2024-01-01T10:00:00.000+0000",
+                "items": [{"field": "status", "fromString": "Open", "toString": "In Progress"}],
+            } for i in range(25)],
+        },
+    }
+
+
+def make_page() -> dict:
+    """Build a Confluence page shaped like a REST response with body.storage."""
+    body = "".join(
+        f"<h2>Section {i}</h2><p>Runbook step {i} with <strong>details</strong>.</p>"
+        for i in range(500))
+    return {
+        "id": "123456",
+        "type": "page",
+        "title": "Service Runbook",
+        "space": {"key": "OPS", "name": "Operations"},
+        "version": {"number": 42},
+        "body": {"storage": {"value": body, "representation": "storage"}},
+        "ancestors": [{"id": str(i), "title": f"Parent {i}"} for i in range(3)],
+        "_expandable": {"children": "/rest/api/content/123456/child",
+                        "descendants": "/rest/api/content/123456/descendant"},
+        "_links": {"webui": "/spaces/OPS/pages/123456",
+                   "self": "https://example.atlassian.net/wiki/rest/api/content/123456"},
+    }
+
+
+def benchmark(name: str, payload, number: int = 50) -> None:
+    """Print size and encode time for each serializer on one payload."""
+    candidates = [("json indent=2 (previous)", lambda: json.dumps(payload, indent=2))]
+    backends = ["json"] + (["orjson"] if ORJSON_AVAILABLE else [])
+    slim = Slimmer()
+    for backend in backends:
+        serializer = Serializer(backend=backend)
+        for fmt in ("compact", "pretty"):
+            candidates.append((
+                f"{backend} {fmt}",
+                lambda s=serializer, f=fmt: s.dumps(payload, f),
+            ))
+        candidates.append((
+            f"{backend} compact + slim",
+            lambda s=serializer: s.dumps(slim(payload), "compact"),
+        ))
+
+    baseline = len(candidates[0][1]().encode("utf-8"))
+    print(f"\n{name}")
+    print("-" * 72)
+    print(f"{'serializer':<28}{'bytes':>12}{'vs previous':>14}{'ms/encode':>14}")
+    for label, encode in candidates:
+        size = len(encode().encode("utf-8"))
+        seconds = timeit.timeit(encode, number=number) / number
+        print(f"{label:<28}{size:>12,}{size / baseline:>13.0%}{seconds * 1000:>14.3f}")
+
+
+def main():
+    """Run the benchmark."""
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            benchmark(sys.argv[1], json.load(f))
+        return
+
+    benchmark("Jira search (50 issues with changelog)", [make_issue(n) for n in range(50)])
+    benchmark("Confluence page (500 sections)", make_page())
+    if not ORJSON_AVAILABLE:
+        print("\norjson not installed; install atlassian-mcp[fast] to compare it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Tests for the ADF renderer."""
+
+import copy
+
+import pytest
+
+from atlassian_mcp.adf import ADFRenderer, is_document, render_documents
+
+
+def text(value, *marks):
+    node = {"type": "text", "text": value}
+    if marks:
+        node["marks"] = [{"type": mark} if isinstance(mark, str) else mark for mark in marks]
+    return node
+
+
+def node(kind, *content, **attrs):
+    result = {"type": kind, "content": list(content)}
+    if attrs:
+        result["attrs"] = attrs
+    return result
+
+
+def paragraph(*content):
+    return node("paragraph", *content)
+
+
+def doc(*content):
+    return {"type": "doc", "version": 1, "content": list(content)}
+
+
+TABLE = doc(node(
+    "table",
+    node("tableRow",
+         node("tableHeader", paragraph(text("Name"))),
+         node("tableHeader", paragraph(text("Value")))),
+    node("tableRow",
+         node("tableCell", paragraph(text("a|b"))),
+         node("tableCell", paragraph(text("1", "strong")))),
+))
+
+NESTED_LIST = doc(node(
+    "bulletList",
+    node("listItem",
+         paragraph(text("one")),
+         node("bulletList",
+              node("listItem",
+                   paragraph(text("two")),
+                   node("orderedList", node("listItem", paragraph(text("three"))))))),
+    node("listItem", paragraph(text("four"))),
+))
+
+CODE_BLOCK = doc(node("codeBlock", text("x = 1\nprint(x)"), language="python"))
+
+PANEL = doc(node(
+    "panel", paragraph(text("Do "), text("not", "em"), text(" run this.")),
+    panelType="warning"))
+
+TASK_LIST = doc(node(
+    "taskList",
+    node("taskItem", text("done"), state="DONE"),
+    node("taskItem", text("todo"), state="TODO"),
+))
+
+MARKS = doc(
+    node("heading", text("Title"), level=2),
+    paragraph(text("see "),
+              text("docs", {"type": "link", "attrs": {"href": "https://e.com"}}),
+              text(" and "), text("x", "code"), {"type": "hardBreak"}, text("next")),
+)
+
+INLINE_NODES = doc(paragraph(
+    {"type": "mention", "attrs": {"text": "@Ann"}}, text(" "),
+    {"type": "status", "attrs": {"text": "DONE"}}, text(" "),
+    {"type": "date", "attrs": {"timestamp": "1700000000000"}},
+))
+
+
+@pytest.mark.parametrize("document, markdown, plain", [
+    (TABLE,
+     "| Name | Value |\n|---|---|\n| a\\|b | **1** |\n",
+     "Name | Value\na|b | 1\n"),
+    (NESTED_LIST,
+     "- one\n  - two\n    1. three\n- four\n",
+     "- one\n  - two\n    1. three\n- four\n"),
+    (CODE_BLOCK,
+     "```python\nx = 1\nprint(x)\n```\n",
+     "x = 1\nprint(x)\n"),
+    (PANEL,
+     "> **Warning**\n>\n> Do *not* run this.\n",
+     "Warning\n\nDo not run this.\n"),
+    (TASK_LIST,
+     "- [x] done\n- [ ] todo\n",
+     "- done\n- todo\n"),
+    (MARKS,
+     "## Title\n\nsee [docs](https://e.com) and `x`\nnext\n",
+     "Title\n\nsee docs and x\nnext\n"),
+    (INLINE_NODES,
+     "@Ann [DONE] 2023-11-14\n",
+     "@Ann [DONE] 2023-11-14\n"),
+])
+def test_render(document, markdown, plain):
+    assert ADFRenderer("markdown").render(document) == markdown
+    assert ADFRenderer("text").render(document) == plain
+
+
+def test_unknown_nodes_keep_their_content():
+    document = doc(
+        paragraph(text("a")),
+        node("mysteryNode", paragraph(text("inner"))),
+        {"type": "extension", "attrs": {"extensionKey": "x"}},
+    )
+    assert ADFRenderer().render(document) == "a\n\ninner\n"
+
+
+def test_deep_documents_do_not_recurse():
+    document = paragraph(text("leaf"))
+    for _ in range(5000):
+        document = node("blockquote", document)
+    assert ADFRenderer("text").render(doc(document)) == "leaf\n"
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ADFRenderer("html")
+
+
+def test_render_documents_replaces_documents_by_path():
+    issue = {"key": "A-1", "fields": {
+        "description": CODE_BLOCK,
+        "comment": {"comments": [{"body": PANEL}]},
+        "summary": "plain",
+    }}
+    original = copy.deepcopy(issue)
+    paths = []
+
+    def render(path, document):
+        assert is_document(document)
+        paths.append(path)
+        return path
+
+    result = render_documents(issue, render)
+    assert sorted(paths) == ["fields.comment.comments.0.body", "fields.description"]
+    assert result["fields"]["description"] == "fields.description"
+    assert result["fields"]["comment"]["comments"][0]["body"] == "fields.comment.comments.0.body"
+    assert result["fields"]["summary"] == "plain"
+    assert issue == original
@@ -0,0 +1,156 @@
+"""Tests for output budgets and continuation cursors."""
+
+import asyncio
+import copy
+import json
+
+import pytest
+
+from atlassian_mcp import server
+from atlassian_mcp.budget import Budget, decode_cursor, digest, encode_cursor, measure
+from atlassian_mcp.client import AtlassianClient, AtlassianConfig
+
+
+def make_issue():
+    return {
+        "key": "A-1",
+        "fields": {
+            "description": "d" * 400,
+            "comment": {"comments": [{"body": f"comment {i} " * 5} for i in range(10)]},
+            "attachment": [{"filename": f"file{i}.png"} for i in range(10)],
+        },
+        "changelog": {"histories": [{"id": i, "items": ["x" * 30]} for i in range(10)]},
+    }
+
+
+def compact(value):
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def lookup(value, path):
+    for key in path:
+        value = value[key]
+    return value
+
+
+def test_result_within_budget_is_unchanged():
+    issue = make_issue()
+    result, omitted = Budget(max_tokens=10_000).trim(issue)
+    assert result is issue
+    assert omitted == []
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_non_positive_limits_are_rejected(limit):
+    with pytest.raises(ValueError):
+        Budget(max_tokens=limit)
+    with pytest.raises(ValueError):
+        Budget(max_bytes=limit)
+
+
+def test_trim_drops_low_priority_sections_first():
+    issue = make_issue()
+    original = copy.deepcopy(issue)
+    budget = Budget(max_tokens=300)
+    result, omitted = budget.trim(issue)
+
+    assert budget.fits(measure(compact(result)))
+    # The whole changelog goes before any attachment; comments and the
+    # description are untouched
+    assert [part["path"] for part in omitted] == [
+        ["changelog", "histories"], ["fields", "attachment"]]
+    assert omitted[0] == {"path": ["changelog", "histories"], "start": 0, "stop": 10}
+    assert result["changelog"]["histories"] == []
+    assert result["fields"]["attachment"] == original["fields"]["attachment"][omitted[1]["stop"]:]
+    assert result["fields"]["comment"] == original["fields"]["comment"]
+    assert result["fields"]["description"] == original["fields"]["description"]
+    assert issue == original
+
+
+def test_trim_truncates_the_description_last():
+    issue = make_issue()
+    result, omitted = Budget(max_tokens=100).trim(issue)
+    assert [part["path"] for part in omitted][-1] == ["fields", "description"]
+    start = omitted[-1]["start"]
+    assert result["fields"]["description"] == issue["fields"]["description"][:start]
+
+
+def test_trim_drops_trailing_list_results_but_keeps_one():
+    results = [{"key": f"A-{i}", "summary": "s" * 40} for i in range(10)]
+    trimmed, omitted = Budget(max_tokens=50).trim(results)
+    assert trimmed == results[:len(trimmed)]
+    assert 1 <= len(trimmed) < len(results)
+    assert omitted == [{"path": [], "start": len(trimmed), "stop": None}]
+
+    trimmed, omitted = Budget(max_bytes=10).trim(results)
+    assert len(trimmed) == 1
+
+
+def test_take_returns_every_omitted_part_across_continuations():
+    issue = make_issue()
+    budget = Budget(max_tokens=100)
+    _, parts = budget.trim(issue)
+    expected = {tuple(part["path"]): lookup(issue, part["path"])[part["start"]:part["stop"]]
+                for part in parts}
+
+    collected = {path: type(value)() for path, value in expected.items()}
+    calls = 0
+    while parts:
+        chunks, parts = budget.take(issue, parts)
+        assert chunks, "every continuation must make progress"
+        for chunk in chunks:
+            collected[tuple(chunk["path"])] += chunk["content"]
+        calls += 1
+        assert calls < 100
+    assert collected == expected
+
+
+def test_cursor_round_trip():
+    parts = [{"path": ["fields", "description"], "start": 10, "stop": None}]
+    cursor = encode_cursor("jira_get_issue", parts, "abc123")
+    assert decode_cursor(cursor, "jira_get_issue") == (parts, "abc123")
+
+
+def test_cursor_from_another_tool_is_rejected():
+    cursor = encode_cursor("jira_get_issue", [], "abc123")
+    with pytest.raises(ValueError, match="jira_get_issue"):
+        decode_cursor(cursor, "confluence_get_page")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30=", ""])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "jira_get_issue")
+
+
+def test_digest_ignores_key_order_but_not_content():
+    assert digest({"a": 1, "b": [1, 2]}) == digest({"b": [1, 2], "a": 1})
+    assert digest({"a": 1}) != digest({"a": 2})
+    assert digest([1, 2]) != digest([2, 1])
+
+
+@pytest.fixture
+def offline_server(monkeypatch):
+    client = AtlassianClient(AtlassianConfig(
+        domain="example.atlassian.net", email="user@example.com", jira_token="token"))
+    monkeypatch.setattr(server, "client", client)
+    monkeypatch.setattr(server, "slimmer", None)
+    monkeypatch.setattr(server, "serializer", None)
+    yield server
+    asyncio.run(client.close())
+
+
+def test_continuation_of_a_changed_result_is_rejected(offline_server):
+    issue = make_issue()
+    arguments = {"max_tokens": 100}
+
+    first = asyncio.run(offline_server.respond("jira_get_issue", issue, arguments))
+    cursor = json.loads(first[1].text)["cursor"]
+    again = asyncio.run(offline_server.respond(
+        "jira_get_issue", issue, dict(arguments, cursor=cursor)))
+    assert again[0].text
+
+    issue["fields"]["description"] = "changed " * 50
+    with pytest.raises(ValueError, match="changed since the cursor"):
+        asyncio.run(offline_server.respond(
+            "jira_get_issue", issue, dict(arguments, cursor=cursor)))
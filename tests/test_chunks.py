@@ -0,0 +1,70 @@
+"""Tests for heading-aligned Markdown chunking."""
+
+import pytest
+
+from atlassian_mcp.chunks import chunk_markdown
+
+PARAGRAPHS = "\n\n".join(f"para {i} " * 5 for i in range(10))
+
+DOCUMENT = (
+    "intro\n\n"
+    f"# A\n\n{PARAGRAPHS}\n\n"
+    "## B\n\nshort\n\n"
+    "```\n# not a heading\n```\n\n"
+    "# C\n\nend"
+)
+
+
+def test_chunks_fit_and_cover_the_document():
+    chunks = chunk_markdown(DOCUMENT, 120)
+    assert all(len(chunk["content"]) <= 120 for chunk in chunks)
+    assert [chunk["index"] for chunk in chunks] == list(range(len(chunks)))
+    assert "\n\n".join(chunk["content"] for chunk in chunks) == DOCUMENT
+
+
+def test_oversized_section_splits_at_paragraphs_and_keeps_its_heading():
+    chunks = chunk_markdown(DOCUMENT, 120)
+    section = [chunk for chunk in chunks if chunk["heading"] == "A"]
+    assert len(section) > 1
+    assert section[0]["content"].startswith("# A\n\npara 0")
+    for chunk in section[1:]:
+        assert chunk["content"].startswith("para ")
+
+
+def test_fenced_lines_are_not_headings():
+    headings = [h for chunk in chunk_markdown(DOCUMENT, 120) for h in chunk["headings"]]
+    assert "not a heading" not in headings
+    assert headings.count("B") == 1
+
+
+def test_top_level_heading_starts_a_new_chunk_once_half_full():
+    chunks = chunk_markdown(DOCUMENT, 120)
+    assert chunks[-1]["content"] == "# C\n\nend"
+    assert chunks[-1]["headings"] == ["C"]
+
+
+def test_small_sections_are_packed_together():
+    chunks = chunk_markdown("# A\n\none\n\n### B\n\ntwo\n\n### C\n\nthree", 1000)
+    assert len(chunks) == 1
+    assert chunks[0]["heading"] == "A"
+    assert chunks[0]["headings"] == ["A", "B", "C"]
+
+
+def test_long_paragraph_is_cut_at_max_chars():
+    chunks = chunk_markdown("x" * 25, 10)
+    assert [chunk["content"] for chunk in chunks] == ["x" * 10, "x" * 10, "x" * 5]
+    assert all(chunk["heading"] is None for chunk in chunks)
+
+
+def test_chunking_is_deterministic():
+    assert chunk_markdown(DOCUMENT, 120) == chunk_markdown(DOCUMENT, 120)
+
+
+def test_empty_document_has_no_chunks():
+    assert chunk_markdown("") == []
+
+
+@pytest.mark.parametrize("max_chars", [0, -5])
+def test_non_positive_size_is_rejected(max_chars):
+    with pytest.raises(ValueError):
+        chunk_markdown(DOCUMENT, max_chars)
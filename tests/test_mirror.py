@@ -0,0 +1,115 @@
+"""Tests for the JQL subset evaluated by the Jira mirror."""
+
+import pytest
+
+from atlassian_mcp.mirror import SimpleJQL
+
+
+def issue(key, status=None, assignee=None, resolution=None, labels=(),
+          updated="2024-01-01", created="2023-01-01"):
+    return {"key": key, "fields": {
+        "project": {"key": key.partition("-")[0], "id": "10000", "name": "Alpha"},
+        "status": {"name": status} if status else None,
+        "assignee": {"accountId": "id-" + assignee, "displayName": assignee} if assignee else None,
+        "resolution": {"name": resolution} if resolution else None,
+        "issuetype": {"name": "Bug"},
+        "labels": list(labels),
+        "updated": updated,
+        "created": created,
+    }}
+
+
+ISSUES = [
+    issue("ABC-1", status="Open", assignee="bob", labels=["x"], updated="2024-03-01"),
+    issue("ABC-2", status="Done", assignee="alice", resolution="Fixed", updated="2024-01-01"),
+    issue("ABC-10", status="Open", updated="2024-02-01"),
+    issue("ABC-3", updated="2024-04-01"),
+]
+
+
+def search(jql):
+    query = SimpleJQL.parse(jql)
+    assert query is not None, jql
+    return sorted(i["key"] for i in ISSUES if query.matches(i))
+
+
+@pytest.mark.parametrize("jql, keys", [
+    ("project = ABC", ["ABC-1", "ABC-10", "ABC-2", "ABC-3"]),
+    ("project = abc AND status = open", ["ABC-1", "ABC-10"]),
+    ('status = "Done"', ["ABC-2"]),
+    ("issuekey = ABC-2", ["ABC-2"]),
+    ("assignee = bob", ["ABC-1"]),
+    ("assignee in (bob, alice)", ["ABC-1", "ABC-2"]),
+    ("labels in (x)", ["ABC-1"]),
+    ("resolution = Unresolved", ["ABC-1", "ABC-10", "ABC-3"]),
+])
+def test_positive_clauses(jql, keys):
+    assert search(jql) == keys
+
+
+@pytest.mark.parametrize("jql, keys", [
+    # Negated clauses never match an empty field
+    ("assignee != bob", ["ABC-2"]),
+    ("status not in (Done)", ["ABC-1", "ABC-10"]),
+    ("resolution != Unresolved", ["ABC-2"]),
+    ("status NOT IN (Open, Done)", []),
+])
+def test_negated_clauses(jql, keys):
+    assert search(jql) == keys
+
+
+@pytest.mark.parametrize("jql, keys", [
+    ("assignee is EMPTY", ["ABC-10", "ABC-3"]),
+    ("assignee is not empty", ["ABC-1", "ABC-2"]),
+    ("resolution IS NULL", ["ABC-1", "ABC-10", "ABC-3"]),
+    ("assignee = EMPTY", ["ABC-10", "ABC-3"]),
+    ("assignee = null", ["ABC-10", "ABC-3"]),
+    ("assignee != EMPTY", ["ABC-1", "ABC-2"]),
+    ("status in (EMPTY, Open)", ["ABC-1", "ABC-10", "ABC-3"]),
+    ("status not in (EMPTY, Open)", ["ABC-2"]),
+    # A quoted "EMPTY" is an ordinary value
+    ('assignee = "EMPTY"', []),
+])
+def test_empty(jql, keys):
+    assert search(jql) == keys
+
+
+@pytest.mark.parametrize("jql, keys", [
+    ("project = ABC ORDER BY key", ["ABC-1", "ABC-2", "ABC-3", "ABC-10"]),
+    ("project = ABC ORDER BY key DESC", ["ABC-10", "ABC-3", "ABC-2", "ABC-1"]),
+    ("project = ABC ORDER BY updated ASC", ["ABC-2", "ABC-10", "ABC-1", "ABC-3"]),
+    ("project = ABC", ["ABC-3", "ABC-1", "ABC-10", "ABC-2"]),
+    ("project = ABC ORDER BY status, key", None),
+])
+def test_order_by(jql, keys):
+    query = SimpleJQL.parse(jql)
+    if keys is None:
+        assert query is None
+        return
+    assert [i["key"] for i in query.sort(list(ISSUES))] == keys
+
+
+@pytest.mark.parametrize("jql", [
+    "project = ABC OR status = Open",
+    "assignee = currentUser()",
+    "assignee in (membersOf(devs))",
+    "project = ABC AND summary ~ foo",
+    "text ~ foo",
+    "created > -1d",
+    "project = ABC ORDER BY",
+    "project in (ABC",
+    "(project = ABC)",
+    "",
+])
+def test_queries_outside_the_subset_fall_back(jql):
+    assert SimpleJQL.parse(jql) is None
+
+
+@pytest.mark.parametrize("jql, projects", [
+    ("project in (abc, DEF) AND status = Open", ["ABC", "DEF"]),
+    ("key in (ABC-1, XYZ-2)", ["ABC", "XYZ"]),
+    ("status = Open", None),
+    ("project != ABC", None),
+])
+def test_projects(jql, projects):
+    assert SimpleJQL.parse(jql).projects() == projects
@@ -0,0 +1,107 @@
+"""Tests for the Confluence storage-format converter."""
+
+import pytest
+
+from atlassian_mcp.storage import convert_storage
+
+TABLE = (
+    "<table><tbody>"
+    "<tr><th>Name</th><th>Value</th></tr>"
+    "<tr><td>a|b</td><td><strong>1</strong></td></tr>"
+    "</tbody></table>"
+)
+
+NESTED_LIST = (
+    "<ul><li>one<ul><li>two<ol><li>three</li></ol></li></ul></li><li>four</li></ul>"
+)
+
+CODE_MACRO = (
+    '<ac:structured-macro ac:name="code">'
+    '<ac:parameter ac:name="language">python</ac:parameter>'
+    '<ac:plain-text-body><![CDATA[if x < 1:\n    print("<b>")]]></ac:plain-text-body>'
+    "</ac:structured-macro>"
+)
+
+PANEL_MACRO = (
+    '<ac:structured-macro ac:name="warning">'
+    '<ac:parameter ac:name="title">Careful</ac:parameter>'
+    "<ac:rich-text-body><p>Do <em>not</em> run this.</p></ac:rich-text-body>"
+    "</ac:structured-macro>"
+)
+
+TASK_LIST = (
+    "<ac:task-list>"
+    "<ac:task><ac:task-status>complete</ac:task-status>"
+    "<ac:task-body>done</ac:task-body></ac:task>"
+    "<ac:task><ac:task-status>incomplete</ac:task-status>"
+    "<ac:task-body>todo</ac:task-body></ac:task>"
+    "</ac:task-list>"
+)
+
+
+@pytest.mark.parametrize("storage, markdown, text", [
+    (TABLE,
+     "| Name | Value |\n|---|---|\n| a\\|b | **1** |\n",
+     "Name | Value\na|b | 1\n"),
+    (NESTED_LIST,
+     "- one\n  - two\n    1. three\n- four\n",
+     "- one\n  - two\n    1. three\n- four\n"),
+    (CODE_MACRO,
+     '```python\nif x < 1:\n    print("<b>")\n```\n',
+     'if x < 1:\n    print("<b>")\n'),
+    (PANEL_MACRO,
+     "> **Warning: Careful**\n>\n> Do *not* run this.\n",
+     "Warning: Careful\n\nDo not run this.\n"),
+    (TASK_LIST,
+     "- [x] done\n- [ ] todo\n",
+     "- done\n- todo\n"),
+    ("<h1>Title</h1><p>Some <a href='https://e.com'>link</a> and <code>x</code>.</p>",
+     "# Title\n\nSome [link](https://e.com) and `x`.\n",
+     "Title\n\nSome link and x.\n"),
+])
+def test_convert(storage, markdown, text):
+    assert convert_storage(storage, "markdown") == markdown
+    assert convert_storage(storage, "text") == text
+
+
+def test_list_item_paragraphs_stay_in_the_item():
+    storage = "<ul><li><p>para one</p><p>para two</p></li></ul>"
+    assert convert_storage(storage) == "- para one\n  para two\n"
+
+
+def test_unknown_macro_without_body_is_dropped():
+    storage = (
+        '<p>a</p><ac:structured-macro ac:name="toc">'
+        '<ac:parameter ac:name="maxLevel">2</ac:parameter>'
+        "</ac:structured-macro><p>b</p>"
+    )
+    assert convert_storage(storage) == "a\n\nb\n"
+
+
+def test_unknown_macro_keeps_its_body():
+    rich = (
+        '<ac:structured-macro ac:name="details">'
+        "<ac:rich-text-body><p>inside</p></ac:rich-text-body>"
+        "</ac:structured-macro>"
+    )
+    plain = (
+        '<ac:structured-macro ac:name="mystery">'
+        "<ac:plain-text-body><![CDATA[raw]]></ac:plain-text-body>"
+        "</ac:structured-macro>"
+    )
+    assert convert_storage(rich) == "inside\n"
+    assert convert_storage(plain) == "```\nraw\n```\n"
+
+
+def test_jira_macro_renders_the_issue_key():
+    storage = (
+        '<p>Before</p><ac:structured-macro ac:name="jira">'
+        '<ac:parameter ac:name="key">ABC-1</ac:parameter>'
+        "</ac:structured-macro><p>After</p>"
+    )
+    assert convert_storage(storage) == "Before\n\nABC-1\n\nAfter\n"
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        convert_storage(TABLE, "storage")